@@ -1,9 +1,61 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from backend.config import API_KEY, BASE_URL 
+from backend.config import API_KEY, BASE_URL, DETAIL_FETCH_WORKERS
+from backend.http_client import HTTPClient
+from backend.rate_limiter import PRIORITY_INTERACTIVE
+from backend.response_cache import ResponseCache
 
 
 
 class APIHandler:
+    # Shared by every caller, so repeated lookups never leave the machine while fresh
+    cache = ResponseCache()
+
+    # Bounded pool for bulk detail lookups, with one future per movie ID in flight
+    detail_executor = ThreadPoolExecutor(max_workers=DETAIL_FETCH_WORKERS, thread_name_prefix="tmdb-details")
+    in_flight = {}
+    in_flight_lock = threading.Lock()
+
+    @classmethod
+    def get_json(cls, endpoint_name, endpoint, params, priority=PRIORITY_INTERACTIVE):
+        """
+        GET a TMDB endpoint through the response cache.
+        Fresh entries are returned directly, stale ones are revalidated with
+        If-None-Match / If-Modified-Since and reused on a 304.
+        :param endpoint_name: Cache group used to pick the TTL ('movie_details', 'search').
+        :param priority: Rate limiter class, user facing lookups stay interactive.
+        :return: The decoded JSON or None if the request failed.
+        """
+        key = cls.cache.make_key(endpoint, params)
+        entry = cls.cache.get(key)
+        if entry and cls.cache.is_fresh(entry, endpoint_name):
+            return entry["data"]
+
+        headers = cls.cache.conditional_headers(entry)
+
+        try:
+            response = HTTPClient.get(endpoint, params=params, headers=headers, priority=priority)
+        except requests.RequestException as e:
+            if entry:
+                # Offline or TMDB is down, a stale answer is better than none
+                print(f"Request failed, using cached response: {e}")
+                return entry["data"]
+            raise
+
+        if response.status_code == 304 and entry:
+            cls.cache.touch(entry)
+            return entry["data"]
+
+        if response.status_code == 200:
+            data = response.json()
+            cls.cache.put(key, data, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            return data
+
+        print(f"Error: Request to {endpoint} failed. Status code {response.status_code}")
+        print(f"Response content: {response.text}")
+        return None
+
     @classmethod
     def fetch_movie_details(cls, movie_id):
         if not movie_id:
@@ -18,25 +70,60 @@ class APIHandler:
 
         try:
             print(f"Requesting movie details for movie_id: {movie_id}")
-            response = requests.get(endpoint, params=params)
+            data = cls.get_json("movie_details", endpoint, params)
 
-            if response.status_code == 200:
-                data = response.json()
+            if data is not None:
                 return data
             else:
-                print(f"Error: Unable to fetch movie details for movie_id {movie_id}. Status code {response.status_code}")
-                print(f"Response content: {response.text}")
+                print(f"Error: Unable to fetch movie details for movie_id {movie_id}.")
         except Exception as e:
             print(f"Exception occurred while fetching movie details: {e}")
 
         return None
 
     @classmethod
-    def fetch_movies_by_query(cls, query, content_type="movie"):
+    def submit_movie_details(cls, movie_id):
+        """Schedule a detail lookup on the worker pool, joining one already in flight."""
+        with cls.in_flight_lock:
+            future = cls.in_flight.get(movie_id)
+            if future is not None:
+                return future
+            future = cls.detail_executor.submit(cls.fetch_movie_details, movie_id)
+            cls.in_flight[movie_id] = future
+
+        def forget(done_future):
+            with cls.in_flight_lock:
+                if cls.in_flight.get(movie_id) is done_future:
+                    del cls.in_flight[movie_id]
+
+        future.add_done_callback(forget)
+        return future
+
+    @classmethod
+    def fetch_many_movie_details(cls, movie_ids):
+        """
+        Fetch details for several movies concurrently.
+        :param movie_ids: List of TMDB movie IDs, duplicates are only requested once.
+        :return: List of detail dicts (or None for failures) in the same order as movie_ids.
+        """
+        futures = {}
+        for movie_id in movie_ids:
+            if movie_id and movie_id not in futures:
+                futures[movie_id] = cls.submit_movie_details(movie_id)
+
+        results = []
+        for movie_id in movie_ids:
+            future = futures.get(movie_id)
+            results.append(future.result() if future else None)
+        return results
+
+    @classmethod
+    def fetch_movies_by_query(cls, query, content_type="movie", page=1):
         """
         Search for movies or TV series based on a query.
         :param query: The search keyword or phrase.
         :param content_type: Type of content to search for ('movie' or 'tv').
+        :param page: Result page, TMDB returns 20 hits per page.
         :return: List of movies/TV series matching the query or an empty list if an error occurs.
         """
         endpoint = f"{BASE_URL}/search/{content_type}"
@@ -44,15 +131,14 @@ class APIHandler:
             "api_key": API_KEY,
             "query": query,
             "language": "en-US",
-            "page": 1,
+            "page": page,
         }
 
         try:
             print(f"Searching for {content_type} with query: {query}")
-            response = requests.get(endpoint, params=params)
+            data = cls.get_json("search", endpoint, params)
 
-            if response.status_code == 200:
-                data = response.json()
+            if data is not None:
                 results = data.get("results", [])
 
                 # Debugging: print results to check movie IDs
@@ -68,10 +154,8 @@ class APIHandler:
                 valid_results = [movie for movie in results if movie.get("id")]
                 return valid_results
             else:
-                print(f"Error: Unable to fetch search results. Status code {response.status_code}")
-                print(f"Response content: {response.text}")
+                print(f"Error: Unable to fetch search results for query: {query}")
         except Exception as e:
             print(f"Error fetching search results: {e}")
 
         return []
-
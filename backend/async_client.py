@@ -0,0 +1,189 @@
+import asyncio
+import random
+import threading
+import aiohttp
+from backend.api_handler import APIHandler
+from backend.config import (
+    API_KEY,
+    BASE_URL,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_MAX_RETRIES,
+    HTTP_BACKOFF_BASE,
+    HTTP_POOL_SIZE,
+)
+from backend.http_client import RETRY_STATUS_CODES
+from backend.rate_limiter import tmdb_limiter, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+
+
+class AsyncTMDBClient:
+    """
+    asyncio version of the APIHandler lookups and the CineGuru discover calls.
+    All coroutines run on one event loop owned by a background daemon thread, so
+    dozens of requests can overlap without a thread each. Responses share the
+    APIHandler disk cache and the process-wide rate limiter.
+
+    From Tk code, use submit() and hand the returned future to UIDispatcher.watch()
+    to get the result back on the Tk thread.
+    """
+
+    def __init__(self):
+        self.loop = None
+        self.thread = None
+        self.http = None
+        self.start_lock = threading.Lock()
+
+    def start(self):
+        with self.start_lock:
+            if self.loop is not None:
+                return self.loop
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self.thread = threading.Thread(target=run, name="tmdb-async", daemon=True)
+            self.thread.start()
+            ready.wait()
+            self.loop = loop
+            return loop
+
+    def submit(self, coro):
+        """Schedule a coroutine on the client loop from any thread, returns a concurrent Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.start())
+
+    def run(self, coro, timeout=None):
+        """Blocking helper for non-UI callers."""
+        return self.submit(coro).result(timeout)
+
+    def close(self, timeout=5):
+        """Close the HTTP session on the client loop, call when the app exits."""
+        if self.loop is None or self.http is None:
+            return
+        try:
+            self.run(self.http.close(), timeout)
+        except Exception as e:
+            print(f"Failed to close the TMDB session: {e}")
+
+    def session(self):
+        # Created lazily so it is bound to the client loop
+        if self.http is None or self.http.closed:
+            self.http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=HTTP_POOL_SIZE * 2),
+                timeout=aiohttp.ClientTimeout(sock_connect=HTTP_CONNECT_TIMEOUT, sock_read=HTTP_READ_TIMEOUT),
+            )
+        return self.http
+
+    async def get_json(self, endpoint_name, endpoint, params, priority=PRIORITY_INTERACTIVE):
+        """
+        Coroutine counterpart of APIHandler.get_json (same cache, TTLs and revalidation).
+        :param endpoint_name: Cache group used to pick the TTL, or None to bypass the cache.
+        :return: The decoded JSON or None if the request failed.
+        """
+        cache = APIHandler.cache
+        key = cache.make_key(endpoint, params) if endpoint_name else None
+        # Cache reads and writes are file I/O, keep them off the event loop
+        entry = await asyncio.to_thread(cache.get, key) if key else None
+        if entry and cache.is_fresh(entry, endpoint_name):
+            return entry["data"]
+
+        headers = cache.conditional_headers(entry)
+        # aiohttp only accepts str/int params
+        query = {k: str(v) for k, v in params.items() if v is not None}
+
+        for attempt in range(HTTP_MAX_RETRIES + 1):
+            await tmdb_limiter.acquire_async(priority)
+            try:
+                async with self.session().get(endpoint, params=query, headers=headers) as response:
+                    if response.status == 304 and entry:
+                        await asyncio.to_thread(cache.touch, entry)
+                        return entry["data"]
+
+                    if response.status == 200:
+                        data = await response.json()
+                        if key:
+                            await asyncio.to_thread(
+                                cache.put, key, data, response.headers.get("ETag"), response.headers.get("Last-Modified")
+                            )
+                        return data
+
+                    if response.status not in RETRY_STATUS_CODES or attempt == HTTP_MAX_RETRIES:
+                        print(f"Error: Request to {endpoint} failed. Status code {response.status}")
+                        return None
+
+                    if response.status == 429:
+                        tmdb_limiter.throttle(random.uniform(0, HTTP_BACKOFF_BASE * (2 ** attempt)))
+                        continue
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == HTTP_MAX_RETRIES:
+                    print(f"Request to {endpoint} failed: {e}")
+                    return entry["data"] if entry else None
+
+            await asyncio.sleep(random.uniform(0, HTTP_BACKOFF_BASE * (2 ** attempt)))
+
+        return None
+
+    async def fetch_movie_details(self, movie_id):
+        if not movie_id:
+            print("Error: No movie ID provided.")
+            return None
+
+        params = {
+            "api_key": API_KEY,
+            "language": "en-US",
+        }
+        data = await self.get_json("movie_details", f"{BASE_URL}/movie/{movie_id}", params)
+        if data is None:
+            print(f"Error: Unable to fetch movie details for movie_id {movie_id}.")
+        return data
+
+    async def fetch_many_movie_details(self, movie_ids):
+        """Resolve details for all IDs at once, in input order, requesting duplicates only once."""
+        unique_ids = list(dict.fromkeys(movie_id for movie_id in movie_ids if movie_id))
+        results = await asyncio.gather(*(self.fetch_movie_details(movie_id) for movie_id in unique_ids))
+        details = dict(zip(unique_ids, results))
+        return [details.get(movie_id) for movie_id in movie_ids]
+
+    async def fetch_search_page(self, query, content_type="movie", page=1):
+        """
+        One page of search results.
+        :return: (results, total_pages), or None if the request failed.
+        """
+        params = {
+            "api_key": API_KEY,
+            "query": query,
+            "language": "en-US",
+            "page": page,
+        }
+        data = await self.get_json("search", f"{BASE_URL}/search/{content_type}", params)
+        if data is None:
+            print(f"Error: Unable to fetch search results for query: {query}")
+            return None
+        results = [movie for movie in data.get("results", []) if movie.get("id")]
+        return results, data.get("total_pages", 1)
+
+    async def fetch_movies_by_query(self, query, content_type="movie", page=1):
+        page_results = await self.fetch_search_page(query, content_type, page)
+        return page_results[0] if page_results else []
+
+    async def discover_movies(self, params, priority=PRIORITY_BACKGROUND):
+        """One /discover/movie page, not cached since CineGuru wants random pages."""
+        return await self.get_json(None, f"{BASE_URL}/discover/movie", {
+            "api_key": API_KEY,
+            "language": "en-US",
+            **params,
+        }, priority=priority)
+
+    async def discover_pages(self, params, pages, priority=PRIORITY_BACKGROUND):
+        """Fetch several discover pages concurrently, returns one result list per page."""
+        responses = await asyncio.gather(*(
+            self.discover_movies({**params, "page": page}, priority=priority) for page in pages
+        ))
+        return [response.get("results", []) if response else [] for response in responses]
+
+
+# One loop for the whole app
+async_client = AsyncTMDBClient()
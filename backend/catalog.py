@@ -0,0 +1,115 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from backend.config import CATALOG_DB
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS movies (
+    movie_id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    overview TEXT NOT NULL,
+    poster_path TEXT,
+    vote_average REAL,
+    vote_count INTEGER,
+    release_date TEXT,
+    original_language TEXT,
+    genre_ids TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+FIELDS = ["title", "overview", "poster_path", "vote_average", "vote_count", "release_date", "original_language"]
+
+
+class MovieCatalog:
+    """
+    Local copy of the TMDB discover results Cine Guru recommends from.
+    Filled by backend.catalog_ingest, movies come back as discover-style
+    dicts ("id", "genre_ids", ...) so they can be used like API results.
+    """
+
+    def __init__(self, path=CATALOG_DB):
+        self.path = path
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+
+    @staticmethod
+    def row_movie(row):
+        movie = {field: row[field] for field in FIELDS}
+        movie["id"] = row["movie_id"]
+        movie["genre_ids"] = json.loads(row["genre_ids"])
+        return movie
+
+    def upsert_movies(self, movies):
+        """Insert or refresh movies, returns how many were new."""
+        now = time.time()
+        with self.lock, self.conn:
+            before = self.conn.execute("SELECT COUNT(*) FROM movies").fetchone()[0]
+            self.conn.executemany("""
+                INSERT INTO movies (movie_id, title, overview, poster_path, vote_average, vote_count,
+                                    release_date, original_language, genre_ids, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (movie_id) DO UPDATE SET
+                    title = excluded.title,
+                    overview = excluded.overview,
+                    poster_path = excluded.poster_path,
+                    vote_average = excluded.vote_average,
+                    vote_count = excluded.vote_count,
+                    release_date = excluded.release_date,
+                    original_language = excluded.original_language,
+                    genre_ids = excluded.genre_ids,
+                    updated_at = excluded.updated_at
+            """, [
+                (
+                    movie["id"], movie.get("title", ""), movie.get("overview", ""), movie.get("poster_path"),
+                    movie.get("vote_average"), movie.get("vote_count"), movie.get("release_date"),
+                    movie.get("original_language"), json.dumps(movie.get("genre_ids", [])), now,
+                )
+                for movie in movies
+            ])
+            after = self.conn.execute("SELECT COUNT(*) FROM movies").fetchone()[0]
+        return after - before
+
+    def get_many(self, movie_ids):
+        """:return: {movie_id: movie} for the IDs in the catalog."""
+        movies = {}
+        ids = [int(movie_id) for movie_id in movie_ids]
+        with self.lock:
+            # Stay under SQLite's bound parameter limit
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for row in self.conn.execute(f"SELECT * FROM movies WHERE movie_id IN ({placeholders})", chunk):
+                    movies[row["movie_id"]] = self.row_movie(row)
+        return movies
+
+    def all_movies(self):
+        with self.lock:
+            return [self.row_movie(row) for row in self.conn.execute("SELECT * FROM movies ORDER BY movie_id")]
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM movies").fetchone()[0]
+
+    def get_meta(self, name, default=None):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row["value"] if row else default
+
+    def set_meta(self, name, value):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO meta (name, value) VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET value = excluded.value",
+                (name, value),
+            )
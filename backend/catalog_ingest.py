@@ -0,0 +1,87 @@
+"""
+Offline catalog ingest for Cine Guru.
+
+Sweeps TMDB discover for every genre the emotion mapping uses, stores the
+movies in the local catalog, embeds their overviews and rebuilds the vector
+index recommend_movies serves from in offline mode.
+
+    python -m backend.catalog_ingest            # Full sweep
+    python -m backend.catalog_ingest --refresh  # Only movies released since the last run
+"""
+import argparse
+import asyncio
+import datetime
+import numpy as np
+from sentence_transformers import SentenceTransformer
+from backend.async_client import async_client
+from backend.catalog import MovieCatalog
+from backend.cine_guru_backend import all_genre_specs
+from backend.config import CATALOG_INDEX_FILE, CATALOG_PAGES_PER_GENRE, SIMILARITY_MODEL
+from backend.embedding_store import EmbeddingStore, embed_overviews
+from backend.vector_index import IVFIndex
+
+
+async def sweep(genre_specs, pages, released_since=None):
+    """Fetch the discover pages of all genres concurrently (the rate limiter paces them)."""
+    params = {
+        "sort_by": "vote_average.desc",
+        "vote_count.gte": 100,
+        "with_original_language": "en",
+    }
+    if released_since:
+        params["sort_by"] = "popularity.desc"
+        params["primary_release_date.gte"] = released_since
+
+    genre_pages = await asyncio.gather(*(
+        async_client.discover_pages({**params, "with_genres": genre_id}, range(1, pages + 1))
+        for genre_id in genre_specs
+    ))
+
+    movies = {}
+    for result_pages in genre_pages:
+        for results in result_pages:
+            for movie in results:
+                # Same quality bar as the live recommendations
+                if movie.get("id") and movie.get("vote_average", 0) >= 6.5 and movie.get("overview"):
+                    movies[movie["id"]] = movie
+    return list(movies.values())
+
+
+def build_index(catalog, model):
+    """Embed every catalog overview (only new or changed ones hit the model) and write the index."""
+    movies = catalog.all_movies()
+    if not movies:
+        print("Catalog is empty, no index written.")
+        return
+    store = EmbeddingStore(SIMILARITY_MODEL, model.get_sentence_embedding_dimension())
+    embeddings = embed_overviews(model, store, movies)
+    index = IVFIndex.build(np.array([movie["id"] for movie in movies]), embeddings)
+    index.save(CATALOG_INDEX_FILE)
+    print(f"Indexed {len(index)} movies in {len(index.centroids)} clusters.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or refresh the offline Cine Guru catalog.")
+    parser.add_argument("--refresh", action="store_true", help="Only fetch movies released since the last run.")
+    parser.add_argument("--pages", type=int, default=CATALOG_PAGES_PER_GENRE, help="Discover pages per genre.")
+    args = parser.parse_args()
+
+    catalog = MovieCatalog()
+    released_since = catalog.get_meta("last_ingest_date") if args.refresh else None
+    if args.refresh and not released_since:
+        print("No previous ingest found, doing a full sweep.")
+
+    started = datetime.date.today().isoformat()
+    genre_specs = all_genre_specs()
+    print(f"Sweeping {len(genre_specs)} genres, {args.pages} pages each...")
+    movies = async_client.run(sweep(genre_specs, args.pages, released_since))
+
+    added = catalog.upsert_movies(movies)
+    print(f"Fetched {len(movies)} movies, {added} new, {catalog.count()} in the catalog.")
+
+    build_index(catalog, SentenceTransformer(SIMILARITY_MODEL))
+    catalog.set_meta("last_ingest_date", started)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,62 +1,124 @@
-import requests
+import asyncio
+import os
+import numpy as np
 from transformers import pipeline
-from sentence_transformers import SentenceTransformer, util
-import random
-from backend.config import BASE_URL, API_KEY
+from sentence_transformers import SentenceTransformer
+from backend.async_client import async_client
+from backend.catalog import MovieCatalog
+from backend.config import (
+    CATALOG_INDEX_FILE,
+    CATALOG_NPROBE,
+    CATALOG_SEARCH_CANDIDATES,
+    CINE_GURU_MODE,
+    SIMILARITY_MODEL,
+)
+from backend.embedding_store import EmbeddingStore, embed_overviews
+from backend.genre_pool import GenrePools
+from backend.vector_index import IVFIndex
+
+# Revised emotion-to-genre mapping with more appropriate emotional matches
+EMOTION_GENRE_MAPPING = {
+    "joy": [
+        ("35", 0.8),  # Comedy
+        ("10751", 0.7),  # Family
+        ("16", 0.6)  # Animation
+    ],
+    "sadness": [
+        ("18", 0.9),  # Drama - primary match for sadness
+        ("10749", 0.7),  # Romance - can be cathartic
+        ("18,10751", 0.6),  # Drama + Family - uplifting but not jarring
+    ],
+    "anger": [
+        ("18", 0.8),  # Drama
+        ("28", 0.6),  # Action
+        ("53", 0.5)  # Thriller
+    ],
+    "fear": [
+        ("18", 0.8),  # Drama
+        ("9648", 0.7),  # Mystery
+        ("53", 0.6)  # Thriller
+    ],
+    "surprise": [
+        ("878", 0.7),  # Science Fiction
+        ("12", 0.6),  # Adventure
+        ("14", 0.5)  # Fantasy
+    ],
+    "neutral": [
+        ("18", 0.7),  # Drama
+        ("99", 0.6),  # Documentary
+        ("36", 0.5)  # History
+    ]
+}
+
+# Add emotional transition mapping for gradual mood shifts
+EMOTIONAL_TRANSITIONS = {
+    "sadness": {
+        "primary": ["18"],  # Drama first
+        "secondary": ["18,10751"],  # Drama + Family
+        "tertiary": ["10749"]  # Romance
+    }
+}
+
+
+def emotion_genre_weights(emotion):
+    """
+    Genres to recommend from for an emotion.
+    :return: (genre spec, weight, movies wanted) tuples. A spec like "18,10751"
+        means movies with all of those genres.
+    """
+    if emotion == "sadness":
+        # For sadness, follow a specific emotional arc
+        transitions = EMOTIONAL_TRANSITIONS["sadness"]
+        return [
+            (transitions["primary"][0], 0.9, 5),  # Start with pure dramas that acknowledge the emotion
+            (transitions["secondary"][0], 0.7, 3),  # Add some uplifting dramas
+            (transitions["tertiary"][0], 0.5, 2),  # Add a few romantic movies for emotional catharsis
+        ]
+    return [(genre_id, weight, 5) for genre_id, weight in EMOTION_GENRE_MAPPING.get(emotion, [])]
+
+
+def plan_genre_demands(detected_emotions):
+    """
+    Group what all detected emotions want by genre, so each genre is fetched once.
+    :param detected_emotions: {emotion: score}
+    :return: {genre spec: [(movies wanted, weight * score), ...]}, highest weight first.
+    """
+    plan = {}
+    for emotion, score in detected_emotions.items():
+        for genre_id, weight, movies_wanted in emotion_genre_weights(emotion):
+            plan.setdefault(genre_id, []).append((movies_wanted, weight * score))
+    for demands in plan.values():
+        demands.sort(key=lambda demand: demand[1], reverse=True)
+    return plan
+
+
+def all_genre_specs():
+    """Every genre spec any emotion can ask for."""
+    return list(dict.fromkeys(
+        genre_id for emotion in EMOTION_GENRE_MAPPING for genre_id, _, _ in emotion_genre_weights(emotion)
+    ))
+
 
 class CineGuruBackend:
     def __init__(self):
         self.emotion_detector = pipeline("text-classification", model="j-hartmann/emotion-english-distilroberta-base", return_all_scores=True)
-        self.similarity_model = SentenceTransformer('all-MiniLM-L6-v2')
+        self.similarity_model = SentenceTransformer(SIMILARITY_MODEL)
+        # Overviews that were already encoded once skip the transformer
+        self.embedding_store = EmbeddingStore(SIMILARITY_MODEL, self.similarity_model.get_sentence_embedding_dimension())
         
-        self.session = requests.Session()
-        self.session.params = {
-            "api_key": API_KEY,
-            "language": "en-US"
-        }
+        # Live mode samples from per-genre pools a background task keeps filled.
+        # Offline mode never starts it, so it stays off the network
+        self.genre_pools = GenrePools(all_genre_specs())
+        if self.resolve_mode() == "live":
+            self.genre_pools.start()
 
-        # Revised emotion-to-genre mapping with more appropriate emotional matches
-        self.emotion_genre_mapping = {
-            "joy": [
-                ("35", 0.8),  # Comedy
-                ("10751", 0.7),  # Family
-                ("16", 0.6)  # Animation
-            ],
-            "sadness": [
-                ("18", 0.9),  # Drama - primary match for sadness
-                ("10749", 0.7),  # Romance - can be cathartic
-                ("18,10751", 0.6),  # Drama + Family - uplifting but not jarring
-            ],
-            "anger": [
-                ("18", 0.8),  # Drama
-                ("28", 0.6),  # Action
-                ("53", 0.5)  # Thriller
-            ],
-            "fear": [
-                ("18", 0.8),  # Drama
-                ("9648", 0.7),  # Mystery
-                ("53", 0.6)  # Thriller
-            ],
-            "surprise": [
-                ("878", 0.7),  # Science Fiction
-                ("12", 0.6),  # Adventure
-                ("14", 0.5)  # Fantasy
-            ],
-            "neutral": [
-                ("18", 0.7),  # Drama
-                ("99", 0.6),  # Documentary
-                ("36", 0.5)  # History
-            ]
-        }
+        self.emotion_genre_mapping = EMOTION_GENRE_MAPPING
+        self.emotional_transitions = EMOTIONAL_TRANSITIONS
 
-        # Add emotional transition mapping for gradual mood shifts
-        self.emotional_transitions = {
-            "sadness": {
-                "primary": ["18"],  # Drama first
-                "secondary": ["18,10751"],  # Drama + Family
-                "tertiary": ["10749"]  # Romance
-            }
-        }
+        # Offline mode, loaded on first use
+        self.catalog = None
+        self.catalog_index = None
+        self.catalog_index_mtime = None
 
 
     def detect_emotions(self, user_input, top_n=3):
@@ -77,122 +139,156 @@ class CineGuruBackend:
             print(f"Error in emotion detection: {e}")
             return None
 
-    def fetch_movies_for_emotion(self, emotion, emotion_score):
+    async def fetch_movies(self, genre_id, movies_per_genre=5):
+        """Random qualifying movies of a genre, sampled from its background-refreshed pool."""
+        return await self.genre_pools.sample(genre_id, movies_per_genre)
+
+    async def fetch_live_candidates(self, detected_emotions):
         """
-        Fetch movies specifically tailored for an emotion with appropriate transitions
+        (movie, weight) pairs for the detected emotions. Every genre in the plan is
+        sampled once for the summed quota of its demands, then its
+        movies are dealt out to the demands. A movie several demands picked keeps
+        its highest weight, so it is scored once.
         """
-        movies = []
-        
-        if emotion == "sadness":
-            # For sadness, follow a specific emotional arc
-            transitions = self.emotional_transitions["sadness"]
-            
-            # Start with pure dramas that acknowledge the emotion
-            primary_movies = self.fetch_movies(transitions["primary"][0], max_pages=10, movies_per_genre=5)
-            movies.extend([(movie, 0.9) for movie in primary_movies])
-            
-            # Add some uplifting dramas
-            secondary_movies = self.fetch_movies(transitions["secondary"][0], max_pages=10, movies_per_genre=3)
-            movies.extend([(movie, 0.7) for movie in secondary_movies])
-            
-            # Add a few romantic movies for emotional catharsis
-            tertiary_movies = self.fetch_movies(transitions["tertiary"][0], max_pages=10, movies_per_genre=2)
-            movies.extend([(movie, 0.5) for movie in tertiary_movies])
-        else:
-            # Handle other emotions with standard genre mapping
-            for genre_id, weight in self.emotion_genre_mapping.get(emotion, []):
-                genre_movies = self.fetch_movies(genre_id, max_pages=10, movies_per_genre=5)
-                movies.extend([(movie, weight) for movie in genre_movies])
-        
-        return movies
+        plan = plan_genre_demands(detected_emotions)
+        genre_movies = await asyncio.gather(*(
+            self.fetch_movies(genre_id, movies_per_genre=sum(wanted for wanted, _ in demands))
+            for genre_id, demands in plan.items()
+        ))
 
-    def fetch_movies(self, genre_id, max_pages=10, movies_per_genre=5):
+        candidates = {}  # movie_id -> (movie, weight)
+        for demands, movies in zip(plan.values(), genre_movies):
+            offset = 0
+            for movies_wanted, weight in demands:
+                for movie in movies[offset:offset + movies_wanted]:
+                    known = candidates.get(movie["id"])
+                    if known is None or weight > known[1]:
+                        candidates[movie["id"]] = (movie, weight)
+                offset += movies_wanted
+        return list(candidates.values())
+
+    @staticmethod
+    def resolve_mode(mode=None):
+        """Resolve "auto" to "live" or "offline", see recommend()."""
+        mode = mode or CINE_GURU_MODE
+        if mode == "auto":
+            mode = "offline" if os.path.exists(CATALOG_INDEX_FILE) else "live"
+        return mode
+
+    def recommend_movies(self, user_input, top_k=5, mode=None):
+        """Blocking recommend(), for scripts. The UI submits recommend() to async_client instead."""
+        return async_client.run(self.recommend(user_input, top_k, mode))
+
+    async def recommend(self, user_input, top_k=5, mode=None):
         """
-        Enhanced movie fetching with improved randomization
+        Enhanced recommendation system with emotional awareness.
+        Coroutine for the async client loop, the models run in worker threads.
+        :param mode: "live" samples the TMDB genre pools, "offline" serves from the local
+            catalog without network calls, "auto" (default, see CINE_GURU_MODE) uses the
+            catalog once it has been built.
         """
+        detected_emotions = await asyncio.to_thread(self.detect_emotions, user_input)
+        if not detected_emotions:
+            return "Could not detect emotions from input. Please try again with more detailed feelings."
+
+        # Normalized, so a dot product is the cosine similarity
+        query_embedding = await asyncio.to_thread(
+            self.similarity_model.encode, user_input, normalize_embeddings=True, convert_to_numpy=True
+        )
+
+        if self.resolve_mode(mode) == "offline":
+            return await asyncio.to_thread(self.recommend_offline, detected_emotions, query_embedding, top_k)
+
+        # Served from the genre pools, only a genre that was never filled waits for the network
+        self.genre_pools.start()
+        all_movies = await self.fetch_live_candidates(detected_emotions)
+
+        candidates = [(movie, weight) for movie, weight in all_movies if movie.get("overview")]
+        if not candidates:
+            return "No suitable movies found. Please try again with different emotions."
+
+        plot_embeddings = await asyncio.to_thread(self.embed_overviews, [movie for movie, _ in candidates])
+        similarity_scores = plot_embeddings @ query_embedding
+        emotion_weights = np.array([weight for _, weight in candidates], dtype=np.float32)
+        return self.top_recommendations([movie for movie, _ in candidates], similarity_scores, emotion_weights, top_k)
+
+    def top_recommendations(self, movies, similarity_scores, emotion_weights, top_k):
+        final_scores = (similarity_scores + emotion_weights) / 2
+
+        # Only the top k need ordering
+        top_k = min(top_k, len(final_scores))
+        top = np.argpartition(-final_scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-final_scores[top])]
+        return [(float(final_scores[i]), self.movie_summary(movies[i])) for i in top]
+
+    def load_catalog_index(self):
+        """The catalog index, reloaded when catalog_ingest rebuilt it. None if it doesn't exist."""
         try:
-            all_results = []
-            fetched_ids = set()
-            
-            initial_response = self.session.get(f"{BASE_URL}/discover/movie", params={
-                "with_genres": genre_id,
-                "page": 1
-            })
-            total_pages = min(initial_response.json().get("total_pages", 1), 500)
-            
-            pages_to_fetch = random.sample(
-                range(1, total_pages + 1),
-                min(max_pages, total_pages)
-            )
-            
-            for page in pages_to_fetch:
-                response = self.session.get(f"{BASE_URL}/discover/movie", params={
-                    "with_genres": genre_id,
-                    "sort_by": "vote_average.desc",
-                    "vote_count.gte": 100,
-                    "page": page,
-                    "with_original_language": "en"
-                })
-                
-                if response.status_code == 200:
-                    movies = response.json().get("results", [])
-                    random.shuffle(movies)
-                    
-                    for movie in movies:
-                        if (movie.get("id") not in fetched_ids and 
-                            movie.get("vote_average", 0) >= 6.5 and  # Higher quality threshold
-                            movie.get("overview")):
-                            all_results.append(movie)
-                            fetched_ids.add(movie.get("id"))
-            
-            random.shuffle(all_results)
-            return all_results[:movies_per_genre]
-            
-        except requests.RequestException as e:
-            print(f"Error fetching movies: {e}")
-            return []
+            mtime = os.path.getmtime(CATALOG_INDEX_FILE)
+        except OSError:
+            return None
+        if self.catalog_index is None or mtime != self.catalog_index_mtime:
+            self.catalog = self.catalog or MovieCatalog()
+            self.catalog_index = IVFIndex.load(CATALOG_INDEX_FILE)
+            self.catalog_index_mtime = mtime
+        return self.catalog_index
 
-    def recommend_movies(self, user_input):
+    def recommend_offline(self, detected_emotions, query_embedding, top_k):
         """
-        Enhanced recommendation system with emotional awareness
+        Rank catalog movies without touching the network: the index returns the
+        overviews closest to the input, each is weighted by the best matching
+        genre of the detected emotions.
         """
-        detected_emotions = self.detect_emotions(user_input)
-        if not detected_emotions:
-            return "Could not detect emotions from input. Please try again with more detailed feelings."
+        index = self.load_catalog_index()
+        if index is None:
+            return "The movie catalog hasn't been built yet. Run: python -m backend.catalog_ingest"
+
+        movie_ids, similarity_scores = index.search(query_embedding, CATALOG_SEARCH_CANDIDATES, nprobe=CATALOG_NPROBE)
+        catalog_movies = self.catalog.get_many(movie_ids)
 
-        all_movies = []
-        for emotion, score in detected_emotions.items():
-            emotion_movies = self.fetch_movies_for_emotion(emotion, score)
-            all_movies.extend([(movie, weight * score) for movie, weight in emotion_movies])
+        demands = [
+            ({int(genre) for genre in genre_id.split(",")}, weight)
+            for genre_id, genre_demands in plan_genre_demands(detected_emotions).items()
+            for _, weight in genre_demands
+        ]
 
-        if not all_movies:
+        movies, similarities, weights = [], [], []
+        for movie_id, similarity in zip(movie_ids, similarity_scores):
+            movie = catalog_movies.get(int(movie_id))
+            if movie is None:
+                continue
+            genres = set(movie["genre_ids"])
+            weight = max((weight for required, weight in demands if required <= genres), default=0)
+            if weight > 0:
+                movies.append(movie)
+                similarities.append(similarity)
+                weights.append(weight)
+
+        if not movies:
             return "No suitable movies found. Please try again with different emotions."
+        return self.top_recommendations(
+            movies, np.array(similarities, dtype=np.float32), np.array(weights, dtype=np.float32), top_k
+        )
 
-        query_embedding = self.similarity_model.encode(user_input)
-        recommendations = []
-        
-        for movie, emotion_weight in all_movies:
-            if movie.get("overview"):
-                plot_embedding = self.similarity_model.encode(movie["overview"])
-                similarity_score = util.cos_sim(query_embedding, plot_embedding).item()
-                
-                final_score = (similarity_score + emotion_weight) / 2
-                
-                recommendations.append((
-                    final_score,
-                    {
-                        "title": movie.get("title", "Unknown"),
-                        "overview": movie.get("overview", ""),
-                        "poster_path": f"https://image.tmdb.org/t/p/w500{movie.get('poster_path')}" if movie.get("poster_path") else None,
-                        "movie_id": movie.get("id"),
-                        "vote_average": movie.get("vote_average", 0),
-                        "release_date": movie.get("release_date", "Unknown"),
-                        "genre_ids": movie.get("genre_ids", [])
-                    }
-                ))
-
-        recommendations.sort(reverse=True, key=lambda x: x[0])
-        return recommendations[:5]
+    def close(self):
+        """Stop the background pool refresh, call when the app exits."""
+        self.genre_pools.stop()
+
+    def embed_overviews(self, movies):
+        """Normalized overview embeddings, one row per movie, encoding only cache misses."""
+        return embed_overviews(self.similarity_model, self.embedding_store, movies)
+
+    @staticmethod
+    def movie_summary(movie):
+        return {
+            "title": movie.get("title", "Unknown"),
+            "overview": movie.get("overview", ""),
+            "poster_path": f"https://image.tmdb.org/t/p/w500{movie.get('poster_path')}" if movie.get("poster_path") else None,
+            "movie_id": movie.get("id"),
+            "vote_average": movie.get("vote_average", 0),
+            "release_date": movie.get("release_date", "Unknown"),
+            "genre_ids": movie.get("genre_ids", [])
+        }
 
 if __name__ == "__main__":
     cine_guru = CineGuruBackend()
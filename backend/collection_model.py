@@ -0,0 +1,292 @@
+import bisect
+import re
+import threading
+from backend.collection_store import collection_store, CollectionStore, CUSTOM_MOVIE_ID
+from backend.collection_writer import collection_writer
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(str(text or "").lower())
+
+
+class CollectionModel:
+    """
+    In-memory copy of the logged-in user's collection with indexes for the
+    collection page: entries bucketed by status, a genre map and an inverted
+    index of word tokens (title, notes, genres, status, type, rating).
+    Mutations go through the model: the indexes change immediately and the
+    write is queued on the collection writer, filtering and searching never
+    touch the disk.
+    """
+
+    def __init__(self, store=collection_store, writer=collection_writer):
+        self.store = store
+        self.writer = writer
+        self.username = None
+        self.version = 0  # Bumped on every change, lets views skip redundant refreshes
+        self.lock = threading.RLock()
+        self.reset()
+        writer.add_listener(self.on_written)
+
+    def reset(self):
+        self.entries = {}  # entry key -> entry dict
+        self.indexed = {}  # entry key -> (status, genres, tokens) the entry was indexed under
+        self.positions = {}  # entry key -> insertion sequence, for ordering results
+        self.next_position = 0
+        self.status_buckets = {}  # status -> set of entry keys
+        self.genres = {}  # lowercase genre name -> set of entry keys
+        self.tokens = {}  # token -> set of entry keys
+        self.sorted_tokens = []  # tokens in order, for prefix lookups
+
+    @staticmethod
+    def key(entry):
+        return CollectionStore.entry_key(entry.get("movie_id"), entry.get("custom_id"))
+
+    def load(self, username):
+        """Build the model for a user from the store."""
+        # Queued edits have to be in the store before it is read
+        self.writer.flush()
+        with self.lock:
+            self.username = username
+            self.reset()
+            if username:
+                for entry in self.store.all(username):
+                    self.add(entry)
+            self.version += 1
+
+    # Index maintenance
+
+    @staticmethod
+    def entry_tokens(entry):
+        tokens = set(tokenize(entry.get("title")))
+        tokens.update(tokenize(entry.get("notes")))
+        tokens.update(tokenize(entry.get("status")))
+        tokens.update(tokenize(entry.get("type")))
+        tokens.update(tokenize(entry.get("rating")))
+        for genre in entry.get("genres") or []:
+            tokens.update(tokenize(genre.get("name")))
+        return tokens
+
+    @staticmethod
+    def entry_genres(entry):
+        return {(genre.get("name") or "").strip().lower() for genre in entry.get("genres") or [] if genre.get("name")}
+
+    def add(self, entry, position=None):
+        key = self.key(entry)
+        if key in self.entries:
+            # Replacing an entry, its old values must leave the indexes
+            old_position = self.discard(key)
+            if position is None:
+                position = old_position
+        self.entries[key] = entry
+        if position is None:
+            position = self.next_position
+            self.next_position += 1
+        self.positions[key] = position
+
+        # Snapshot of what was indexed, so discard() finds it even if the dict was edited meanwhile
+        status, genres, tokens = entry.get("status"), self.entry_genres(entry), self.entry_tokens(entry)
+        self.indexed[key] = (status, genres, tokens)
+        self.status_buckets.setdefault(status, set()).add(key)
+        for genre in genres:
+            self.genres.setdefault(genre, set()).add(key)
+        for token in tokens:
+            keys = self.tokens.get(token)
+            if keys is None:
+                keys = self.tokens[token] = set()
+                bisect.insort(self.sorted_tokens, token)
+            keys.add(key)
+
+    def discard(self, key):
+        """Drop an entry from every index, returns its position or None."""
+        if self.entries.pop(key, None) is None:
+            return None
+
+        status, genres, tokens = self.indexed.pop(key)
+        self.discard_from(self.status_buckets, status, key)
+        for genre in genres:
+            self.discard_from(self.genres, genre, key)
+        for token in tokens:
+            if self.discard_from(self.tokens, token, key):
+                del self.sorted_tokens[bisect.bisect_left(self.sorted_tokens, token)]
+        return self.positions.pop(key)
+
+    @staticmethod
+    def discard_from(index, value, key):
+        """Remove key from index[value], returns True if that emptied the bucket."""
+        keys = index.get(value)
+        if keys is None:
+            return False
+        keys.discard(key)
+        if not keys:
+            del index[value]
+            return True
+        return False
+
+    def replace(self, key, entry):
+        # Keep the entry where it was in the collection
+        position = self.discard(key)
+        self.add(entry, position)
+        self.version += 1
+
+    # Mutations. Entries of the loaded user are written behind, other users' directly
+
+    def upsert(self, username, entry):
+        entry = CollectionStore.with_custom_id(entry)
+        with self.lock:
+            if username == self.username:
+                key = self.key(entry)
+                self.replace(key, entry)
+                self.writer.put(username, key, entry)
+                return
+        self.store.upsert(username, entry)
+
+    def update(self, username, movie_id, changes, custom_id=None):
+        """:return: The updated entry, or None if it doesn't exist."""
+        key = CollectionStore.entry_key(movie_id, custom_id)
+        with self.lock:
+            if username == self.username:
+                if key not in self.entries:
+                    return None
+                entry = {**self.entries[key], **changes}
+                self.replace(key, entry)
+                self.writer.put(username, key, entry, set(changes))
+                return entry
+        return self.store.update(username, movie_id, changes, custom_id)
+
+    def delete(self, username, movie_id, custom_id=None):
+        key = CollectionStore.entry_key(movie_id, custom_id)
+        with self.lock:
+            if username == self.username:
+                removed = self.discard(key) is not None
+                self.version += 1
+                self.writer.delete(username, key)
+                return removed
+        return self.store.delete(username, movie_id, custom_id)
+
+    # Bulk mutations, each written as a single transaction
+
+    def bulk_update(self, username, keys, changes):
+        """
+        Apply the same changes (e.g. {"status": "Watched"}) to several entries.
+        :param keys: Entry keys, see key().
+        :return: The updated entries.
+        """
+        with self.lock:
+            if username != self.username:
+                return self.bulk_write_through(username, keys, changes)
+
+            updated = []
+            for key in keys:
+                if key in self.entries:
+                    entry = {**self.entries[key], **changes}
+                    self.replace(key, entry)
+                    updated.append((key, entry, set(changes)))
+            self.writer.queue_many(username, updated)
+            return [entry for _, entry, _ in updated]
+
+    def bulk_delete(self, username, keys):
+        """:return: Number of entries removed."""
+        with self.lock:
+            if username != self.username:
+                return len(self.bulk_write_through(username, keys, None))
+
+            removed = [key for key in keys if self.discard(key) is not None]
+            self.version += 1
+            self.writer.queue_many(username, [(key, None, None) for key in removed])
+            return len(removed)
+
+    def bulk_write_through(self, username, keys, changes):
+        """Bulk change for a user that isn't loaded, straight to the store. changes None deletes."""
+        self.writer.flush()
+        keys = set(keys)
+        fields = set(changes) if changes is not None else None
+        batch = []
+        for entry in self.store.all(username):
+            key = self.key(entry)
+            if key in keys:
+                batch.append((username, key, None if changes is None else {**entry, **changes}, fields))
+        results = self.store.write_batch(batch)
+        return [written for _, _, _, written in results] if changes is not None else results
+
+    def on_written(self, results):
+        """
+        Writer listener: pick up the new versions, and the fields another instance
+        changed if a write had to be merged. Skipped for entries edited again since.
+        """
+        with self.lock:
+            for username, _, entry, written in results:
+                if username != self.username or written is None:
+                    continue
+                key = self.key(written)
+                if self.entries.get(key) is not entry:
+                    continue
+                if {**written, "version": None} == {**entry, "version": None}:
+                    self.entries[key] = written
+                else:
+                    self.replace(key, written)
+
+    # Queries
+
+    def ordered(self, keys):
+        # Copies, callers editing a result must not change the indexed entries
+        return [dict(self.entries[key]) for key in sorted(keys, key=self.positions.get)]
+
+    def all(self):
+        with self.lock:
+            return self.ordered(self.entries)
+
+    def filter(self, status=None):
+        """Entries with the given watch status, all entries for None."""
+        with self.lock:
+            if not status:
+                return self.ordered(self.entries)
+            return self.ordered(self.status_buckets.get(status, ()))
+
+    def by_genre(self, genre):
+        with self.lock:
+            return self.ordered(self.genres.get(genre.strip().lower(), ()))
+
+    def custom_title_taken(self, title, exclude_key=None):
+        """True if another custom movie of the loaded user already has this title (ignoring case)."""
+        title = (title or "").strip().lower()
+        with self.lock:
+            return any(
+                key != exclude_key and (entry.get("title") or "").strip().lower() == title
+                for key, entry in self.entries.items() if entry.get("movie_id") == CUSTOM_MOVIE_ID
+            )
+
+    def tokens_with_prefix(self, prefix):
+        index = bisect.bisect_left(self.sorted_tokens, prefix)
+        while index < len(self.sorted_tokens) and self.sorted_tokens[index].startswith(prefix):
+            yield self.sorted_tokens[index]
+            index += 1
+
+    def search(self, text, status=None):
+        """
+        Entries where every word of text starts some word of the title, notes,
+        genres, status, type or rating ("hor" finds Horror).
+        """
+        words = tokenize(text)
+        with self.lock:
+            if not words:
+                return self.filter(status)
+
+            matches = None
+            for word in words:
+                word_matches = set()
+                for token in self.tokens_with_prefix(word):
+                    word_matches |= self.tokens[token]
+                matches = word_matches if matches is None else matches & word_matches
+                if not matches:
+                    return []
+
+            if status:
+                matches &= self.status_buckets.get(status, set())
+            return self.ordered(matches)
+
+
+# Collection of the logged-in user, loaded by the collection page
+collection_model = CollectionModel()
@@ -0,0 +1,381 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from backend.config import (
+    COLLECTION_CAS_RETRIES,
+    COLLECTION_DB,
+    COLLECTION_WAL_CHECKPOINT_BYTES,
+    COLLECTION_CHECKPOINT_INTERVAL,
+    USER_DATA_FOLDER,
+)
+from backend.file_lock import database_lock
+
+CUSTOM_MOVIE_ID = -1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS collection (
+    entry_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    entry_key TEXT NOT NULL,
+    movie_id INTEGER NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    status TEXT,
+    rating INTEGER,
+    notes TEXT,
+    data TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1,
+    UNIQUE (username, entry_key)
+);
+CREATE INDEX IF NOT EXISTS idx_collection_user_movie ON collection (username, movie_id);
+CREATE INDEX IF NOT EXISTS idx_collection_user_status ON collection (username, status);
+CREATE INDEX IF NOT EXISTS idx_collection_user_title ON collection (username, title);
+CREATE TABLE IF NOT EXISTS migrations (
+    name TEXT PRIMARY KEY
+);
+"""
+
+
+class CollectionStore:
+    """
+    SQLite (WAL mode) repository for the users' movie collections.
+    Entries are the same dicts the JSON files used to hold. TMDB movies are
+    identified by movie_id, custom movies (movie_id -1) by a generated
+    entry["custom_id"], so renaming one never collides with another.
+    Each thread gets its own connection.
+
+    A write only appends its pages to the write-ahead log and fsyncs it, so
+    it is small and survives a crash. Folding the log back into the database
+    is left to a background thread (start_compactor) instead of SQLite's
+    automatic checkpoint, which would run on whichever thread commits.
+
+    Several app instances may share the database. Every row has a version
+    that each write bumps, and entries read from the store carry it as
+    entry["version"]. write_batch only overwrites a row if it still has the
+    version the writer started from. Otherwise it re-reads the row and applies
+    just the changed fields on top (compare-and-swap with retry), so edits
+    from another instance aren't lost.
+    """
+
+    def __init__(self, path=COLLECTION_DB, checkpoint_bytes=COLLECTION_WAL_CHECKPOINT_BYTES,
+                 checkpoint_interval=COLLECTION_CHECKPOINT_INTERVAL):
+        self.path = path
+        self.checkpoint_bytes = checkpoint_bytes
+        self.checkpoint_interval = checkpoint_interval
+        self.local = threading.local()
+        self.compactor = None
+        self.stopping = threading.Event()
+        self.setup_lock = threading.Lock()
+        self.ready = False  # The database is created on first use, not on import
+
+    def setup(self, conn):
+        with self.setup_lock:
+            if self.ready:
+                return
+            with conn:
+                conn.executescript(SCHEMA)
+                columns = {row["name"] for row in conn.execute("PRAGMA table_info(collection)")}
+                if "version" not in columns:
+                    # Databases created before entries were versioned
+                    conn.execute("ALTER TABLE collection ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+                self.assign_custom_ids(conn)
+            self.ready = True
+
+    def assign_custom_ids(self, conn):
+        """Custom movies used to be keyed by title, give the ones stored that way a custom_id."""
+        if conn.execute("SELECT 1 FROM migrations WHERE name = 'custom_ids'").fetchone():
+            return
+        rows = conn.execute(
+            "SELECT entry_id, data FROM collection WHERE movie_id = ?", (CUSTOM_MOVIE_ID,)
+        ).fetchall()
+        for row in rows:
+            entry = self.with_custom_id(json.loads(row["data"]))
+            conn.execute(
+                "UPDATE collection SET entry_key = ?, data = ? WHERE entry_id = ?",
+                (self.entry_key(CUSTOM_MOVIE_ID, entry["custom_id"]), json.dumps(entry), row["entry_id"]),
+            )
+        conn.execute("INSERT INTO migrations (name) VALUES ('custom_ids')")
+
+    def connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            # fsync the log on every commit, checkpoints happen in the compactor
+            conn.execute("PRAGMA synchronous=FULL")
+            conn.execute("PRAGMA wal_autocheckpoint=0")
+            self.setup(conn)
+            self.local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """
+        Write transaction that takes the database write lock up front, so a
+        read-then-write inside it can't interleave with another instance.
+        """
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    def wal_size(self):
+        try:
+            return os.path.getsize(f"{self.path}-wal")
+        except OSError:
+            return 0
+
+    def checkpoint(self):
+        """Copy the log into the database and truncate it, returns False if readers kept it busy."""
+        busy, _, _ = self.connection().execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        return not busy
+
+    def start_compactor(self):
+        """Checkpoint in a daemon thread whenever the log passes checkpoint_bytes."""
+        if self.compactor is not None:
+            return
+
+        def run():
+            while not self.stopping.wait(self.checkpoint_interval):
+                if self.wal_size() > self.checkpoint_bytes:
+                    try:
+                        self.checkpoint()
+                    except sqlite3.Error as e:
+                        print(f"Collection checkpoint failed: {e}")
+
+        self.compactor = threading.Thread(target=run, name="collection-compactor", daemon=True)
+        self.compactor.start()
+
+    def close(self):
+        """Stop the compactor and leave a fully checkpointed database behind."""
+        self.stopping.set()
+        try:
+            self.checkpoint()
+        except sqlite3.Error as e:
+            print(f"Collection checkpoint failed: {e}")
+
+    @staticmethod
+    def entry_key(movie_id, custom_id=None):
+        if movie_id == CUSTOM_MOVIE_ID:
+            return f"custom:{custom_id or ''}"
+        return str(movie_id)
+
+    @staticmethod
+    def with_custom_id(entry):
+        """The entry, with a new custom_id if it is a custom movie that has none yet."""
+        if entry.get("movie_id") == CUSTOM_MOVIE_ID and not entry.get("custom_id"):
+            return {**entry, "custom_id": uuid.uuid4().hex}
+        return entry
+
+    @staticmethod
+    def row_values(username, entry):
+        movie_id = entry.get("movie_id")
+        # The version lives in its own column
+        data = {field: value for field, value in entry.items() if field != "version"}
+        return (
+            username,
+            CollectionStore.entry_key(movie_id, entry.get("custom_id")),
+            movie_id,
+            entry.get("title") or "",
+            entry.get("status"),
+            entry.get("rating"),
+            entry.get("notes"),
+            json.dumps(data),
+        )
+
+    @staticmethod
+    def row_entry(row):
+        entry = json.loads(row["data"])
+        entry["version"] = row["version"]
+        return entry
+
+    def upsert(self, username, entry):
+        """Insert the entry or replace the one with the same movie (custom movies: same custom_id)."""
+        with self.transaction() as conn:
+            self.upsert_rows(conn, username, [self.with_custom_id(entry)])
+
+    def upsert_rows(self, conn, username, entries):
+        conn.executemany("""
+            INSERT INTO collection (username, entry_key, movie_id, title, status, rating, notes, data)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (username, entry_key) DO UPDATE SET
+                movie_id = excluded.movie_id,
+                title = excluded.title,
+                status = excluded.status,
+                rating = excluded.rating,
+                notes = excluded.notes,
+                data = excluded.data,
+                version = collection.version + 1
+        """, [self.row_values(username, entry) for entry in entries])
+
+    def read_row(self, conn, username, key):
+        return conn.execute(
+            "SELECT data, version FROM collection WHERE username = ? AND entry_key = ?", (username, key)
+        ).fetchone()
+
+    def update(self, username, movie_id, changes, custom_id=None):
+        """
+        Merge changes into an existing entry.
+        :param custom_id: Needed to find custom movies.
+        :return: The updated entry, or None if it doesn't exist.
+        """
+        key = self.entry_key(movie_id, custom_id)
+        with self.transaction() as conn:
+            row = self.read_row(conn, username, key)
+            if row is None:
+                return None
+            entry = {**self.row_entry(row), **changes}
+            return self.write_entry(conn, username, key, entry, set(changes))
+
+    def write_entry(self, conn, username, key, entry, fields=None):
+        """
+        Compare-and-swap one entry against the version it carries.
+        :param fields: Names of the fields this write changes. If the row moved on
+            since entry was read, only these are applied on top of the stored entry.
+            None means the whole entry replaces it.
+        :return: The entry as written, with its new version.
+        """
+        base_version = entry.get("version")
+        for _ in range(COLLECTION_CAS_RETRIES):
+            row = self.read_row(conn, username, key)
+            if row is None:
+                self.upsert_rows(conn, username, [entry])
+                return self.row_entry(self.read_row(conn, username, key))
+
+            if row["version"] != base_version:
+                # Changed by another instance since this entry was read
+                stored = self.row_entry(row)
+                changed = entry if fields is None else {field: entry[field] for field in fields if field in entry}
+                entry = {**stored, **changed}
+                base_version = row["version"]
+
+            values = self.row_values(username, entry)
+            cursor = conn.execute("""
+                UPDATE collection
+                SET movie_id = ?, title = ?, status = ?, rating = ?, notes = ?, data = ?, version = version + 1
+                WHERE username = ? AND entry_key = ? AND version = ?
+            """, values[2:] + (username, key, base_version))
+            if cursor.rowcount:
+                return {**entry, "version": base_version + 1}
+
+        raise sqlite3.OperationalError(f"Collection entry {key} kept changing, giving up")
+
+    def write_batch(self, changes):
+        """
+        Apply many writes in one transaction.
+        :param changes: (username, entry_key, entry, fields) tuples. entry replaces the row
+            stored under entry_key, see write_entry() for fields.
+            entry None deletes the row.
+        :return: (username, entry_key, entry, written) per change, written is the stored
+            entry with its new version (None for deletes).
+        """
+        results = []
+        with self.transaction() as conn:
+            for username, key, entry, fields in changes:
+                if entry is None:
+                    conn.execute("DELETE FROM collection WHERE username = ? AND entry_key = ?", (username, key))
+                    results.append((username, key, None, None))
+                else:
+                    results.append((username, key, entry, self.write_entry(conn, username, key, entry, fields)))
+        return results
+
+    def delete(self, username, movie_id, custom_id=None):
+        """:return: True if an entry was removed."""
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM collection WHERE username = ? AND entry_key = ?",
+                (username, self.entry_key(movie_id, custom_id)),
+            )
+            return cursor.rowcount > 0
+
+    def get(self, username, movie_id, custom_id=None):
+        row = self.read_row(self.connection(), username, self.entry_key(movie_id, custom_id))
+        return self.row_entry(row) if row else None
+
+    def all(self, username):
+        """Every entry of the user, oldest first."""
+        return self.query(username)
+
+    def query(self, username, status=None, search=None):
+        """
+        Entries of the user, oldest first.
+        :param status: Only entries with this watch status.
+        :param search: Case-insensitive text matched against title, notes, status, rating, type and genres.
+        """
+        sql = "SELECT data, version FROM collection WHERE username = ?"
+        params = [username]
+        if status:
+            sql += " AND status = ?"
+            params.append(status)
+        if search:
+            # % and _ in the search text are literal characters
+            escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            pattern = f"%{escaped}%"
+            sql += r""" AND (
+                title LIKE ? ESCAPE '\' OR notes LIKE ? ESCAPE '\' OR status LIKE ? ESCAPE '\'
+                OR CAST(rating AS TEXT) LIKE ? ESCAPE '\'
+                OR json_extract(data, '$.type') LIKE ? ESCAPE '\'
+                OR EXISTS (
+                    SELECT 1 FROM json_each(collection.data, '$.genres')
+                    WHERE json_extract(json_each.value, '$.name') LIKE ? ESCAPE '\'
+                )
+            )"""
+            params.extend([pattern] * 6)
+        sql += " ORDER BY entry_id"
+        return [self.row_entry(row) for row in self.connection().execute(sql, params)]
+
+    def migrate_json_files(self, folder=USER_DATA_FOLDER):
+        """
+        One-time import of the old <username>.json collection files.
+        Each file is imported in a single transaction and remembered, so later
+        runs skip it. Unreadable files are reported and retried next time.
+        """
+        if not os.path.isdir(folder):
+            return
+
+        # Instances starting at the same time must not import the same file twice
+        with database_lock:
+            self.import_json_files(folder)
+
+    def import_json_files(self, folder):
+        conn = self.connection()
+        done = {row["name"] for row in conn.execute("SELECT name FROM migrations")}
+
+        for file_name in sorted(os.listdir(folder)):
+            if not file_name.endswith(".json"):
+                continue
+            username = file_name[:-len(".json")]
+            marker = f"json:{username}"
+            if marker in done:
+                continue
+
+            try:
+                with open(os.path.join(folder, file_name), "r") as file:
+                    entries = json.load(file)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Skipping collection file {file_name}: {e}")
+                continue
+
+            # New accounts were created with an empty {} file
+            if not isinstance(entries, list):
+                entries = []
+
+            with self.transaction() as conn:
+                # Custom movies with the same title were separate entries in the JSON file, and stay separate
+                self.upsert_rows(conn, username, [
+                    self.with_custom_id(entry) for entry in entries if isinstance(entry, dict) and "movie_id" in entry
+                ])
+                conn.execute("INSERT OR IGNORE INTO migrations (name) VALUES (?)", (marker,))
+            print(f"Migrated {len(entries)} collection entries for {username}")
+
+
+# Opened on first use, MovieApp runs the JSON migration and starts the compactor
+collection_store = CollectionStore()
@@ -0,0 +1,111 @@
+import sqlite3
+import threading
+import time
+from backend.collection_store import collection_store
+from backend.config import COLLECTION_WRITE_DELAY
+
+
+class CollectionWriter:
+    """
+    Write-behind queue in front of the collection store.
+    Edits are kept per entry, so dragging a rating slider or editing the same
+    movie several times leaves one pending write, and everything queued within
+    delay seconds of the first edit is written by a worker thread in a single
+    transaction. Listeners get one call per written batch.
+
+    Each pending write remembers which fields were edited, so if another
+    instance changed the entry meanwhile only those fields are applied on
+    top of its version (see CollectionStore.write_entry).
+
+    Call flush() before the process or the session ends (logout, window close).
+    """
+
+    def __init__(self, store=collection_store, delay=COLLECTION_WRITE_DELAY):
+        self.store = store
+        self.delay = delay
+        self.pending = {}  # (username, entry key) -> (entry to write or None to delete, edited fields or None for all)
+        self.deadline = None
+        self.listeners = []
+        self.condition = threading.Condition()
+        self.flush_lock = threading.Lock()  # Worker and explicit flushes write one at a time
+        self.worker = threading.Thread(target=self.run, name="collection-writer", daemon=True)
+        self.worker.start()
+
+    def add_listener(self, callback):
+        """
+        callback(results) runs after each batch, on the writing thread. results are
+        (username, key, entry, written) tuples as returned by CollectionStore.write_batch.
+        """
+        self.listeners.append(callback)
+
+    def put(self, username, key, entry, fields=None):
+        """
+        Queue entry to replace the one stored under key.
+        :param fields: Names of the edited fields, None if the whole entry is new.
+        """
+        self.queue_many(username, [(key, entry, fields)])
+
+    def delete(self, username, key):
+        self.queue_many(username, [(key, None, None)])
+
+    def queue_many(self, username, changes):
+        """Queue several (key, entry or None, fields) writes at once, so they land in the same transaction."""
+        with self.condition:
+            for key, entry, fields in changes:
+                queued = self.pending.get((username, key))
+                if entry is not None and queued is not None and queued[0] is not None:
+                    # Coalesced edits change the union of their fields
+                    fields = None if fields is None or queued[1] is None else fields | queued[1]
+                self.pending[(username, key)] = (entry, fields)
+
+            if self.deadline is None:
+                self.deadline = time.monotonic() + self.delay
+                self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.deadline is None:
+                    self.condition.wait()
+                remaining = self.deadline - time.monotonic()
+                if remaining > 0:
+                    self.condition.wait(remaining)
+                    continue
+            self.flush()
+
+    def flush(self):
+        """Write everything queued now, on the calling thread."""
+        with self.flush_lock:
+            with self.condition:
+                batch = [(username, key, entry, fields) for (username, key), (entry, fields) in self.pending.items()]
+                self.pending.clear()
+                self.deadline = None
+            if not batch:
+                return
+
+            try:
+                results = self.store.write_batch(batch)
+            except sqlite3.Error as e:
+                print(f"Failed to write collection changes, retrying: {e}")
+                self.requeue(batch)
+                return
+
+        for listener in self.listeners:
+            try:
+                listener(results)
+            except Exception as e:
+                print(f"Collection change listener failed: {e}")
+
+    def requeue(self, batch):
+        # Edits made since the batch was taken are newer and win
+        with self.condition:
+            for username, key, entry, fields in batch:
+                if (username, key) in self.pending:
+                    continue
+                self.pending[(username, key)] = (entry, fields)
+            if self.deadline is None:
+                self.deadline = time.monotonic() + self.delay
+                self.condition.notify()
+
+
+collection_writer = CollectionWriter()
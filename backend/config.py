@@ -4,4 +4,66 @@ USERS_FILE = "backend/database/users.json"
 USER_DATA_FOLDER = "backend/database/user_movie_data"
 IMAGES_FOLDER = "backend/database/movie_images"
 
+# TMDB response cache
+CACHE_FOLDER = "backend/database/cache"
+CACHE_MAX_BYTES = 50 * 1024 * 1024
+CACHE_TTLS = {
+    "movie_details": 7 * 24 * 60 * 60,  # details barely change, revalidate weekly
+    "search": 60 * 60,  # search rankings move around, keep for an hour
+}
 
+# Shared HTTP client
+HTTP_CONNECT_TIMEOUT = 3.05
+HTTP_READ_TIMEOUT = 10
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_BASE = 0.5  # seconds, doubled on every retry
+HTTP_POOL_SIZE = 16
+DETAIL_FETCH_WORKERS = 8
+
+# TMDB rate limiting (token bucket shared by the whole process)
+TMDB_RATE_PER_SECOND = 20
+TMDB_BURST = 20
+
+# Resized poster thumbnails
+POSTER_CACHE_FOLDER = f"{IMAGES_FOLDER}/thumbnails"
+POSTER_CACHE_MAX_BYTES = 100 * 1024 * 1024
+POSTER_SIZE = (180, 270)
+POSTER_WORKERS = 6
+
+# Search result paging
+SEARCH_CACHE_QUERIES = 32
+SEARCH_CACHE_PAGES_PER_QUERY = 10
+
+# User collections
+COLLECTION_DB = "backend/database/collections.db"
+# Fold the write-ahead log back into the database once it grows past this
+COLLECTION_WAL_CHECKPOINT_BYTES = 1 * 1024 * 1024
+COLLECTION_CHECKPOINT_INTERVAL = 5  # seconds
+# Collection edits are coalesced for this long before they are written
+COLLECTION_WRITE_DELAY = 0.5  # seconds
+
+# User accounts
+USERS_DB = "backend/database/users.db"
+
+# Shared by all CineBook instances using this database folder
+DATABASE_LOCK_FILE = "backend/database/.cinebook.lock"
+COLLECTION_CAS_RETRIES = 5
+
+# Cine Guru
+SIMILARITY_MODEL = "all-MiniLM-L6-v2"
+EMBEDDING_FOLDER = "backend/database/embeddings"
+# Compact once dead rows are more than this share of the embedding matrix
+EMBEDDING_COMPACT_RATIO = 0.5
+EMBEDDING_COMPACT_MIN_ROWS = 1000
+# Live mode samples from per-genre pools refilled in the background
+GENRE_POOL_REFRESH_INTERVAL = 30 * 60  # Seconds
+GENRE_POOL_PAGES_PER_REFILL = 10
+GENRE_POOL_MAX_MOVIES = 400
+# Offline catalog, built by `python -m backend.catalog_ingest`
+CATALOG_DB = "backend/database/catalog.db"
+CATALOG_INDEX_FILE = "backend/database/catalog_index.npz"
+CATALOG_PAGES_PER_GENRE = 25
+CATALOG_SEARCH_CANDIDATES = 200
+CATALOG_NPROBE = 8
+# "live" samples TMDB per request, "offline" serves from the catalog, "auto" uses the catalog once it exists
+CINE_GURU_MODE = "auto"
@@ -0,0 +1,205 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import numpy as np
+from backend.config import EMBEDDING_FOLDER, EMBEDDING_COMPACT_MIN_ROWS, EMBEDDING_COMPACT_RATIO
+from backend.file_lock import FileLock
+
+
+class EmbeddingStore:
+    """
+    Overview embeddings of one sentence model, kept on disk between runs.
+    Vectors are rows of a float32 matrix file read through np.memmap, and a
+    JSON index maps each movie ID to its row and a hash of the overview it was
+    computed from. A changed overview simply gets a new row, the old one is
+    dead until the next compaction rewrites the matrix without it.
+
+    Appends write the rows first and the index last, so after a crash the
+    index never points at rows that weren't written.
+    """
+
+    def __init__(self, model_name, dim, folder=EMBEDDING_FOLDER,
+                 compact_min_rows=EMBEDDING_COMPACT_MIN_ROWS, compact_ratio=EMBEDDING_COMPACT_RATIO):
+        self.model_name = model_name
+        self.dim = dim
+        self.compact_min_rows = compact_min_rows
+        self.compact_ratio = compact_ratio
+        os.makedirs(folder, exist_ok=True)
+
+        base = os.path.join(folder, re.sub(r"[^A-Za-z0-9_.-]", "_", model_name))
+        self.matrix_path = f"{base}.f32"
+        self.index_path = f"{base}.index.json"
+        self.file_lock = FileLock(f"{base}.lock")  # Other instances share the files
+        self.lock = threading.Lock()
+
+        self.index = {}  # movie_id -> (row, overview hash)
+        self.rows = 0  # Valid rows in the matrix file
+        self.index_stamp = None  # (mtime_ns, size) of the index file when it was read
+        self.matrix = None
+        self.mapped_rows = 0
+        self.load_index()
+
+    @staticmethod
+    def overview_hash(overview):
+        return hashlib.sha1(overview.encode("utf-8")).hexdigest()[:16]
+
+    def index_file_stamp(self):
+        try:
+            stat = os.stat(self.index_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def load_index(self):
+        self.unmap()  # Remap, the file may have been compacted
+        stamp = self.index_file_stamp()
+        try:
+            with open(self.index_path, "r") as file:
+                data = json.load(file)
+        except (OSError, json.JSONDecodeError):
+            self.index, self.rows, self.index_stamp = {}, 0, stamp
+            return
+
+        if data.get("dim") != self.dim:
+            # Different model output size, start over
+            self.index, self.rows, self.index_stamp = {}, 0, stamp
+            return
+        self.index = {int(movie_id): (row, digest) for movie_id, (row, digest) in data["entries"].items()}
+        self.rows = data["rows"]
+        self.index_stamp = stamp
+
+    def refresh_index(self):
+        """Pick up rows another instance appended since the index was read."""
+        if self.index_file_stamp() != self.index_stamp:
+            self.load_index()
+
+    def save_index(self):
+        data = {
+            "model": self.model_name,
+            "dim": self.dim,
+            "rows": self.rows,
+            "entries": {str(movie_id): [row, digest] for movie_id, (row, digest) in self.index.items()},
+        }
+        temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(data, file)
+        os.replace(temp_path, self.index_path)
+        self.index_stamp = self.index_file_stamp()
+
+    def mapped(self):
+        return self.rows == 0 or (self.matrix is not None and self.mapped_rows == self.rows)
+
+    def unmap(self):
+        """Close the memmap, Windows can't replace a file that is still mapped."""
+        if self.matrix is None:
+            return
+        mmap = self.matrix._mmap
+        self.matrix = None  # Drops the last reference to the array, so the map can be closed
+        if mmap is not None:
+            mmap.close()
+
+    def view(self):
+        """Read-only memmap of the valid rows, remapped when the file grew."""
+        if self.rows == 0:
+            return np.empty((0, self.dim), dtype=np.float32)
+        if self.matrix is None or self.mapped_rows != self.rows:
+            self.matrix = np.memmap(self.matrix_path, dtype=np.float32, mode="r", shape=(self.rows, self.dim))
+            self.mapped_rows = self.rows
+        return self.matrix
+
+    def lookup(self, movie_ids, overviews):
+        """
+        :return: (vectors, missing). vectors is an (n, dim) array with the cached rows
+            filled in, missing lists the positions that still need encoding.
+        """
+        vectors = np.zeros((len(movie_ids), self.dim), dtype=np.float32)
+        positions, rows, missing = [], [], []
+        with self.lock:
+            if self.index_file_stamp() != self.index_stamp or not self.mapped():
+                # Another instance changed the files or they aren't mapped yet. Map them
+                # under the file lock so a compaction can't swap the matrix meanwhile;
+                # an existing map keeps reading the file it was opened on.
+                with self.file_lock:
+                    self.refresh_index()
+                    matrix = self.view()
+            else:
+                matrix = self.view()
+            for position, (movie_id, overview) in enumerate(zip(movie_ids, overviews)):
+                cached = self.index.get(movie_id)
+                if cached and cached[1] == self.overview_hash(overview):
+                    positions.append(position)
+                    rows.append(cached[0])
+                else:
+                    missing.append(position)
+            if rows:
+                vectors[positions] = matrix[rows]
+        return vectors, missing
+
+    def add(self, movie_ids, overviews, vectors):
+        """Append new vectors (replacing older ones for the same movie) and compact if worthwhile."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self.lock, self.file_lock:
+            self.refresh_index()
+            with open(self.matrix_path, "ab+") as file:
+                # Drop rows a crashed append left behind the index
+                file.truncate(self.rows * self.dim * 4)
+                file.seek(0, os.SEEK_END)
+                file.write(vectors.tobytes())
+            for offset, (movie_id, overview) in enumerate(zip(movie_ids, overviews)):
+                self.index[movie_id] = (self.rows + offset, self.overview_hash(overview))
+            self.rows += len(vectors)
+            self.save_index()
+
+            dead_rows = self.rows - len(self.index)
+            if self.rows >= self.compact_min_rows and dead_rows > self.rows * self.compact_ratio:
+                self.compact()
+
+    def compact(self):
+        """Rewrite the matrix with only the live rows. Call with both locks held."""
+        movie_ids = list(self.index)
+        live_rows = [self.index[movie_id][0] for movie_id in movie_ids]
+
+        temp_path = f"{self.matrix_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(np.ascontiguousarray(self.view()[live_rows]).tobytes())
+        self.unmap()
+        os.replace(temp_path, self.matrix_path)
+
+        self.index = {movie_id: (row, self.index[movie_id][1]) for row, movie_id in enumerate(movie_ids)}
+        self.rows = len(movie_ids)
+        self.save_index()
+        print(f"Compacted {self.model_name} embeddings to {self.rows} rows")
+
+
+def embed_overviews(model, store, movies):
+    """
+    Normalized overview embeddings, one row per movie. Cached vectors come from
+    the store, the rest are encoded by the sentence model in one batch and added to it.
+    """
+    movie_ids = [movie.get("id") for movie in movies]
+    overviews = [movie["overview"] for movie in movies]
+    embeddings, missing = store.lookup(movie_ids, overviews)
+
+    if missing:
+        # The same movie can be listed more than once, encode it once
+        unique = list(dict.fromkeys((movie_ids[i], overviews[i]) for i in missing))
+        encoded = model.encode(
+            [overview for _, overview in unique],
+            batch_size=64,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        )
+        rows = {key: row for row, key in enumerate(unique)}
+        embeddings[missing] = encoded[[rows[(movie_ids[i], overviews[i])] for i in missing]]
+
+        # Movies without an ID can't be looked up again
+        keep = [row for row, (movie_id, _) in enumerate(unique) if movie_id is not None]
+        if keep:
+            store.add(
+                [unique[row][0] for row in keep],
+                [unique[row][1] for row in keep],
+                encoded[keep],
+            )
+    return embeddings
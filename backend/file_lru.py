@@ -0,0 +1,120 @@
+import os
+import threading
+from collections import OrderedDict
+
+
+class FileLRU:
+    """
+    A folder of cache files with a size budget, shared by the response and
+    poster caches. An in-memory index keeps the files in access order and the
+    least recently used ones are deleted once the folder passes max_bytes.
+
+    The lock only guards the index. Reads, writes and deletes happen outside
+    it, so threads hitting the cache at the same time don't wait on each
+    other's disk I/O. A file that vanishes between the index check and the
+    read is treated as a miss and dropped from the index.
+    """
+
+    def __init__(self, folder, max_bytes, suffix):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.lock = threading.Lock()
+        self.index = OrderedDict()  # file name -> size in bytes, oldest access first
+        self.total_bytes = 0
+        self.load_index()
+
+    def load_index(self):
+        """Rebuild the index from the files already on disk, ordered by last use (mtime)."""
+        os.makedirs(self.folder, exist_ok=True)
+        files = []
+        for name in os.listdir(self.folder):
+            if not name.endswith(self.suffix):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.folder, name))
+            except OSError:
+                continue
+            files.append((stat.st_mtime, name, stat.st_size))
+
+        for _, name, size in sorted(files):
+            self.index[name] = size
+            self.total_bytes += size
+
+    def path(self, name):
+        return os.path.join(self.folder, name)
+
+    def contains(self, name):
+        with self.lock:
+            return name in self.index
+
+    def mark_used(self, name, touch_file=True):
+        """Move name to the recent end, touch_file also bumps its mtime for the next load_index."""
+        with self.lock:
+            if name not in self.index:
+                return
+            self.index.move_to_end(name)
+        if touch_file:
+            try:
+                os.utime(self.path(name))
+            except OSError:
+                pass
+
+    def read(self, name):
+        """:return: The file contents, or None if it isn't cached."""
+        if not self.contains(name):
+            return None
+        try:
+            with open(self.path(name), "rb") as file:
+                payload = file.read()
+        except OSError:
+            self.discard(name)
+            return None
+        self.mark_used(name)
+        return payload
+
+    def write(self, name, payload):
+        """Store payload (bytes) under name, evicting old files if over budget. :return: False on failure."""
+        path = self.path(name)
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            # Unique per process and thread, instances may share the folder
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as file:
+                file.write(payload)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Error writing cache file {name}: {e}")
+            return False
+
+        evicted = []
+        with self.lock:
+            self.total_bytes -= self.index.pop(name, 0)
+            self.index[name] = len(payload)
+            self.total_bytes += len(payload)
+            while self.total_bytes > self.max_bytes and len(self.index) > 1:
+                oldest, size = self.index.popitem(last=False)
+                self.total_bytes -= size
+                evicted.append(oldest)
+        self.delete_files(evicted)
+        return True
+
+    def discard(self, name):
+        """Drop a broken or unwanted file."""
+        with self.lock:
+            self.total_bytes -= self.index.pop(name, 0)
+        self.delete_files([name])
+
+    def clear(self):
+        with self.lock:
+            names = list(self.index)
+            self.index.clear()
+            self.total_bytes = 0
+        self.delete_files(names)
+
+    def delete_files(self, names):
+        for name in names:
+            try:
+                os.remove(self.path(name))
+            except OSError:
+                pass
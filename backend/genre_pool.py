@@ -0,0 +1,115 @@
+import asyncio
+import random
+from backend.async_client import async_client
+from backend.config import GENRE_POOL_MAX_MOVIES, GENRE_POOL_PAGES_PER_REFILL, GENRE_POOL_REFRESH_INTERVAL
+from backend.rate_limiter import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+
+DISCOVER_PARAMS = {
+    "sort_by": "vote_average.desc",
+    "vote_count.gte": 100,
+    "with_original_language": "en",
+}
+
+
+def qualifies(movie):
+    """The quality bar for Cine Guru recommendations."""
+    return bool(
+        movie.get("id")
+        and movie.get("vote_average", 0) >= 6.5
+        and (movie.get("vote_count") or 0) >= 100
+        and movie.get("original_language", "en") == "en"
+        and movie.get("overview")
+    )
+
+
+class GenrePools:
+    """
+    In-memory pools of qualifying movies per genre spec, so recommendations sample
+    from memory instead of fetching discover pages. A background task on the
+    async client loop refills every pool with a few random discover pages on a
+    schedule; the oldest movies rotate out once a pool is full, which keeps the
+    variety the per-request page sampling gave.
+
+    Pools are only touched on the client loop, so they need no locking. A
+    request for a genre that was never filled waits for its first refill,
+    fetched at interactive priority so it goes ahead of the background sweep.
+    """
+
+    def __init__(self, genre_specs, pages_per_refill=GENRE_POOL_PAGES_PER_REFILL,
+                 max_movies=GENRE_POOL_MAX_MOVIES, refresh_interval=GENRE_POOL_REFRESH_INTERVAL):
+        self.genre_specs = list(genre_specs)
+        self.pages_per_refill = pages_per_refill
+        self.max_movies = max_movies
+        self.refresh_interval = refresh_interval
+        self.pools = {}  # genre spec -> {movie_id: movie}, oldest first
+        self.total_pages = {}  # genre spec -> discover page count
+        self.refills = {}  # genre spec -> (latest refill task, its priority)
+        self.task = None
+
+    def start(self):
+        """Start the refresh task, safe to call more than once."""
+        if self.task is None:
+            self.task = async_client.submit(self.run())
+
+    def stop(self):
+        """Cancel the refresh task and any refill still running."""
+        if self.task is None:
+            return
+        self.task.cancel()
+        self.task = None
+        async_client.loop.call_soon_threadsafe(self.cancel_refills)
+
+    def cancel_refills(self):
+        for task, _ in self.refills.values():
+            task.cancel()
+
+    async def run(self):
+        while True:
+            await asyncio.gather(*(self.refill(genre_id) for genre_id in self.genre_specs), return_exceptions=True)
+            await asyncio.sleep(self.refresh_interval)
+
+    def refill(self, genre_id, priority=PRIORITY_BACKGROUND):
+        """
+        Refill one pool. Callers asking while a refill runs share it, unless it
+        runs at a lower priority than they need.
+        """
+        running = self.refills.get(genre_id)
+        if running is not None and not running[0].done() and running[1] <= priority:
+            return running[0]
+        task = asyncio.ensure_future(self.fetch_into_pool(genre_id, priority))
+        self.refills[genre_id] = (task, priority)
+        return task
+
+    async def fetch_into_pool(self, genre_id, priority=PRIORITY_BACKGROUND):
+        params = {**DISCOVER_PARAMS, "with_genres": genre_id}
+        prefetched = {}
+        total_pages = self.total_pages.get(genre_id)
+        if total_pages is None:
+            first_page = await async_client.discover_movies({**params, "page": 1}, priority=priority)
+            if first_page is None:
+                return
+            total_pages = max(1, min(first_page.get("total_pages", 1), 500))
+            self.total_pages[genre_id] = total_pages
+            prefetched[1] = first_page.get("results", [])
+
+        pages = random.sample(range(1, total_pages + 1), min(self.pages_per_refill, total_pages))
+        missing_pages = [page for page in pages if page not in prefetched]
+        fetched = dict(zip(missing_pages, await async_client.discover_pages(params, missing_pages, priority=priority)))
+
+        pool = self.pools.setdefault(genre_id, {})
+        for page in pages:
+            for movie in prefetched.get(page) or fetched.get(page, []):
+                if qualifies(movie):
+                    # Re-inserting moves a movie to the fresh end
+                    pool.pop(movie["id"], None)
+                    pool[movie["id"]] = movie
+        # Rotate out the movies that were seen longest ago
+        for movie_id in list(pool)[:max(0, len(pool) - self.max_movies)]:
+            del pool[movie_id]
+
+    async def sample(self, genre_id, count):
+        """:return: Up to count random movies of the genre."""
+        if not self.pools.get(genre_id):
+            await self.refill(genre_id, PRIORITY_INTERACTIVE)
+        movies = list(self.pools.get(genre_id, {}).values())
+        return random.sample(movies, min(count, len(movies)))
@@ -0,0 +1,99 @@
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from backend.config import (
+    BASE_URL,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_MAX_RETRIES,
+    HTTP_BACKOFF_BASE,
+    HTTP_POOL_SIZE,
+)
+from backend.rate_limiter import tmdb_limiter, PRIORITY_INTERACTIVE
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class HTTPClient:
+    """
+    One keep-alive session shared by the whole app.
+    The underlying urllib3 pools are thread safe, so TMDB lookups and poster
+    downloads from any thread reuse the same TCP/TLS connections.
+    Every request has connect/read timeouts and 429/5xx answers are retried
+    with jittered exponential backoff. Calls to the TMDB API wait for a token
+    from the shared rate limiter first.
+    """
+
+    _session = None
+    _session_lock = threading.Lock()
+
+    @classmethod
+    def session(cls):
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    cls._session = session
+        return cls._session
+
+    @classmethod
+    def get(cls, url, params=None, headers=None, timeout=None, max_retries=HTTP_MAX_RETRIES,
+            priority=PRIORITY_INTERACTIVE):
+        """
+        GET url through the shared session.
+        :param timeout: (connect, read) tuple, defaults to the values in config.
+        :param priority: Rate limiter class for TMDB API calls (see backend.rate_limiter).
+        :return: The final response. Network errors are raised once retries run out.
+        """
+        timeout = timeout or (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+        rate_limited = url.startswith(BASE_URL)
+
+        attempt = 0
+        while True:
+            if rate_limited:
+                tmdb_limiter.acquire(priority)
+            try:
+                response = cls.session().get(url, params=params, headers=headers, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= max_retries:
+                    raise
+                print(f"Request to {url} failed ({e}), retrying...")
+                time.sleep(cls.backoff_delay(attempt))
+                attempt += 1
+                continue
+
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= max_retries:
+                return response
+
+            delay = cls.retry_after(response)
+            if delay is None:
+                delay = cls.backoff_delay(attempt)
+            print(f"Request to {url} returned {response.status_code}, retrying in {delay:.2f}s")
+            response.close()
+            if rate_limited and response.status_code == 429:
+                # Drain the shared bucket so every caller backs off, the next
+                # acquire() then does the waiting for us
+                tmdb_limiter.throttle(delay)
+            else:
+                time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def backoff_delay(attempt):
+        # Full jitter keeps parallel workers from retrying in lockstep
+        return random.uniform(0, HTTP_BACKOFF_BASE * (2 ** attempt))
+
+    @staticmethod
+    def retry_after(response):
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return min(float(value), 30)
+        except ValueError:
+            return None
@@ -0,0 +1,125 @@
+import hashlib
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+from backend.config import POSTER_CACHE_FOLDER, POSTER_CACHE_MAX_BYTES, POSTER_SIZE, POSTER_WORKERS
+from backend.file_lru import FileLRU
+from backend.http_client import HTTPClient
+
+POSTER_BASE_URL = "https://image.tmdb.org/t/p"
+# Poster widths TMDB serves, smallest first ("original" is the fallback)
+POSTER_VARIANT_WIDTHS = [92, 154, 185, 342, 500, 780]
+POSTER_ASPECT = 2 / 3
+
+
+class PosterCache:
+    """
+    Already resized poster thumbnails on disk.
+    Files are keyed by the poster source and the target size, and the least
+    recently used ones are deleted once the folder passes max_bytes.
+    """
+
+    def __init__(self, folder=POSTER_CACHE_FOLDER, max_bytes=POSTER_CACHE_MAX_BYTES):
+        self.folder = folder
+        self.files = FileLRU(folder, max_bytes, ".jpg")
+
+    @staticmethod
+    def source_key(poster_path):
+        """
+        TMDB poster paths are unique per image, local files also include their
+        size and mtime so a replaced upload gets a new thumbnail.
+        """
+        if poster_path.startswith("/"):
+            return f"tmdb:{poster_path}"
+        stat = os.stat(poster_path)
+        return f"file:{os.path.abspath(poster_path)}:{stat.st_size}:{int(stat.st_mtime)}"
+
+    def file_name(self, source_key, size):
+        digest = hashlib.sha1(f"{source_key}|{size[0]}x{size[1]}".encode("utf-8")).hexdigest()
+        return f"{digest}.jpg"
+
+    def get(self, source_key, size):
+        """Return the cached thumbnail as a PIL image or None."""
+        name = self.file_name(source_key, size)
+        payload = self.files.read(name)
+        if payload is None:
+            return None
+        # Decoded outside any lock, the poster workers load hits in parallel
+        try:
+            image = Image.open(io.BytesIO(payload))
+            image.load()
+        except (OSError, ValueError):
+            self.files.discard(name)
+            return None
+        return image
+
+    def put(self, source_key, size, image):
+        buffer = io.BytesIO()
+        image.convert("RGB").save(buffer, format="JPEG", quality=90)
+        self.files.write(self.file_name(source_key, size), buffer.getvalue())
+
+
+poster_cache = PosterCache()
+# Downloads and decodes happen here, never on the Tk thread
+poster_executor = ThreadPoolExecutor(max_workers=POSTER_WORKERS, thread_name_prefix="poster")
+
+
+def select_poster_variant(pixel_size):
+    """Smallest TMDB poster variant that still covers pixel_size without upscaling."""
+    needed_width = max(pixel_size[0], pixel_size[1] * POSTER_ASPECT)
+    for width in POSTER_VARIANT_WIDTHS:
+        if width >= needed_width:
+            return f"w{width}"
+    return "original"
+
+
+def decode_thumbnail(image_data, pixel_size):
+    """
+    Decode and resize to pixel_size, letting the decoder do most of the scaling.
+    JPEGs use draft mode so libjpeg decodes straight at 1/2, 1/4 or 1/8 scale,
+    other formats get an integer reduce() before the final LANCZOS pass.
+    """
+    image = Image.open(io.BytesIO(image_data))
+    if image.format == "JPEG":
+        image.draft("RGB", pixel_size)
+    else:
+        factor = min(image.width // pixel_size[0], image.height // pixel_size[1])
+        if factor > 1:
+            image = image.reduce(factor)
+    return image.resize(pixel_size, Image.LANCZOS)
+
+
+def load_poster_thumbnail(poster_path, size=POSTER_SIZE, scale=1.0):
+    """
+    Return the poster resized for a size box as a PIL image.
+    :param poster_path: TMDB poster path ("/abc.jpg") or a local file path.
+    :param scale: Widget scaling factor, on HiDPI screens the thumbnail gets that many more pixels.
+    Thumbnails come from the disk cache when possible, so repeated renders skip
+    both the download and the resize.
+    """
+    pixel_size = (round(size[0] * scale), round(size[1] * scale))
+    source_key = poster_cache.source_key(poster_path)
+    image = poster_cache.get(source_key, pixel_size)
+    if image is not None:
+        return image
+
+    if poster_path.startswith("/"):
+        # Remote URL, only as large as the card needs
+        variant = select_poster_variant(pixel_size)
+        response = HTTPClient.get(f"{POSTER_BASE_URL}/{variant}{poster_path}")
+        response.raise_for_status()
+        image_data = response.content
+    else:
+        # Local file
+        with open(poster_path, "rb") as file:
+            image_data = file.read()
+
+    image = decode_thumbnail(image_data, pixel_size)
+    poster_cache.put(source_key, pixel_size, image)
+    return image
+
+
+def submit_poster_thumbnail(poster_path, size=POSTER_SIZE, scale=1.0):
+    """Load a thumbnail on the poster worker pool, returns a concurrent Future."""
+    return poster_executor.submit(load_poster_thumbnail, poster_path, size, scale)
@@ -0,0 +1,120 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from backend.config import TMDB_RATE_PER_SECOND, TMDB_BURST
+
+# Lower value is served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+
+class TokenBucketLimiter:
+    """
+    Token bucket with a priority queue of waiters.
+    Callers block in acquire() until a token is free instead of failing, and a
+    waiting interactive call always goes before any waiting background call.
+    """
+
+    def __init__(self, rate=TMDB_RATE_PER_SECOND, burst=TMDB_BURST):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.condition = threading.Condition()
+        self.waiters = []  # heap of [priority, sequence]
+        self.sequence = itertools.count()
+        self.calls = 0
+        self.throttled_calls = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def enqueue(self, priority):
+        ticket = [priority, next(self.sequence)]
+        heapq.heappush(self.waiters, ticket)
+        return ticket
+
+    def try_take(self, ticket):
+        """
+        Must be called with the condition held.
+        :return: 0 if the ticket got a token, otherwise how long to wait (None = until notified).
+        """
+        self.refill()
+        if self.waiters[0] is not ticket:
+            return None
+        if self.tokens >= 1:
+            heapq.heappop(self.waiters)
+            self.tokens -= 1
+            self.condition.notify_all()
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def record(self, waited):
+        self.calls += 1
+        if waited > 0.001:
+            self.throttled_calls += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def acquire(self, priority=PRIORITY_INTERACTIVE):
+        """Block until a token is available for this priority class."""
+        start = time.monotonic()
+        with self.condition:
+            ticket = self.enqueue(priority)
+            while True:
+                delay = self.try_take(ticket)
+                if delay == 0:
+                    break
+                self.condition.wait(delay)
+            self.record(time.monotonic() - start)
+
+    async def acquire_async(self, priority=PRIORITY_INTERACTIVE):
+        """Same as acquire() for coroutines, polls instead of blocking the event loop."""
+        start = time.monotonic()
+        with self.condition:
+            ticket = self.enqueue(priority)
+        granted = False
+        try:
+            while True:
+                with self.condition:
+                    delay = self.try_take(ticket)
+                if delay == 0:
+                    granted = True
+                    break
+                await asyncio.sleep(min(delay, 0.05) if delay is not None else 0.05)
+        finally:
+            with self.condition:
+                if granted:
+                    self.record(time.monotonic() - start)
+                else:
+                    # Cancelled while queued, don't leave a dead ticket at the head
+                    self.waiters.remove(ticket)
+                    heapq.heapify(self.waiters)
+                    self.condition.notify_all()
+
+    def throttle(self, seconds):
+        """Empty the bucket for a while, e.g. after TMDB answered 429."""
+        with self.condition:
+            self.refill()
+            self.tokens = min(self.tokens, -seconds * self.rate)
+
+    def stats(self):
+        with self.condition:
+            return {
+                "calls": self.calls,
+                "throttled_calls": self.throttled_calls,
+                "total_wait": self.total_wait,
+                "max_wait": self.max_wait,
+                "average_wait": self.total_wait / self.throttled_calls if self.throttled_calls else 0.0,
+                "queued": len(self.waiters),
+            }
+
+
+# Every TMDB API request in the process shares this bucket
+tmdb_limiter = TokenBucketLimiter()
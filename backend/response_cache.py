@@ -0,0 +1,124 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+from backend.config import CACHE_FOLDER, CACHE_MAX_BYTES, CACHE_TTLS
+from backend.file_lru import FileLRU
+
+DEFAULT_TTL = 60 * 60
+MEMORY_ENTRIES = 512
+
+
+class ResponseCache:
+    """
+    Disk-backed cache for TMDB JSON responses.
+    Each entry lives in its own file named after the hash of the request key.
+    Entries keep the ETag / Last-Modified headers so stale ones can be revalidated,
+    and the least recently used files are evicted once the folder grows past max_bytes.
+    The most recently used entries are also kept in memory, so grids rebinding
+    cards (scrolling, resizing) don't go back to disk.
+    """
+
+    def __init__(self, folder=CACHE_FOLDER, max_bytes=CACHE_MAX_BYTES, ttls=None):
+        self.folder = folder
+        self.ttls = ttls if ttls is not None else CACHE_TTLS
+        self.files = FileLRU(folder, max_bytes, ".json")
+        self.lock = threading.Lock()  # Guards memory, file I/O happens outside it
+        self.memory = OrderedDict()  # file name -> entry, small LRU in front of the disk
+
+    @staticmethod
+    def make_key(endpoint, params):
+        """Build a stable key from the endpoint and its params (the API key is left out)."""
+        normalized = {}
+        for key, value in (params or {}).items():
+            if key == "api_key" or value is None:
+                continue
+            value = str(value).strip()
+            if key == "query":
+                # TMDB search is case insensitive, so "Batman" and "batman " share an entry
+                value = " ".join(value.lower().split())
+            normalized[key] = value
+        return f"{endpoint}?{urlencode(sorted(normalized.items()))}"
+
+    def file_name(self, key):
+        return hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json"
+
+    def get(self, key):
+        """Return the cached entry for key (fresh or not) or None."""
+        name = self.file_name(key)
+        with self.lock:
+            entry = self.memory.get(name)
+            if entry is not None:
+                self.memory.move_to_end(name)
+        if entry is not None:
+            if self.files.contains(name):
+                self.files.mark_used(name, touch_file=False)
+                return entry
+            # Evicted from disk meanwhile
+            with self.lock:
+                self.memory.pop(name, None)
+            return None
+
+        payload = self.files.read(name)
+        if payload is None:
+            return None
+        try:
+            entry = json.loads(payload)
+        except ValueError:
+            self.files.discard(name)
+            return None
+        if entry.get("key") != key:
+            return None
+
+        self.remember(name, entry)
+        return entry
+
+    def is_fresh(self, entry, endpoint_name):
+        ttl = self.ttls.get(endpoint_name, DEFAULT_TTL)
+        return time.time() - entry.get("stored_at", 0) < ttl
+
+    @staticmethod
+    def conditional_headers(entry):
+        """Headers that let TMDB answer 304 Not Modified for a stale entry."""
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, key, data, etag=None, last_modified=None):
+        """Store a response and evict old entries if the cache is over budget."""
+        entry = {
+            "key": key,
+            "stored_at": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+            "data": data,
+        }
+        self.write(key, entry)
+
+    def touch(self, entry):
+        """Mark a revalidated entry (HTTP 304) as fresh again."""
+        entry["stored_at"] = time.time()
+        self.write(entry["key"], entry)
+
+    def write(self, key, entry):
+        name = self.file_name(key)
+        if self.files.write(name, json.dumps(entry).encode("utf-8")):
+            self.remember(name, entry)
+
+    def remember(self, name, entry):
+        with self.lock:
+            self.memory[name] = entry
+            self.memory.move_to_end(name)
+            while len(self.memory) > MEMORY_ENTRIES:
+                self.memory.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.memory.clear()
+        self.files.clear()
@@ -0,0 +1,122 @@
+import threading
+from collections import OrderedDict
+from backend.async_client import async_client
+from backend.config import SEARCH_CACHE_QUERIES, SEARCH_CACHE_PAGES_PER_QUERY
+
+
+class SearchPageCache:
+    """
+    Bounded in-memory cache of fetched search pages.
+    Keeps the pages of the most recent queries, so repeating a query or paging
+    through it again doesn't go back to TMDB. While typing, a longer query can be
+    answered from a cached prefix until its own results arrive.
+    """
+
+    def __init__(self, max_queries=SEARCH_CACHE_QUERIES, max_pages=SEARCH_CACHE_PAGES_PER_QUERY):
+        self.max_queries = max_queries
+        self.max_pages = max_pages
+        self.queries = OrderedDict()  # (content_type, query) -> {"total_pages": n, "pages": {page: (movies, details)}}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(query, content_type):
+        return content_type, " ".join(query.lower().split())
+
+    def get(self, query, content_type, page):
+        """:return: (movies, details, total_pages) or None."""
+        with self.lock:
+            entry = self.queries.get(self.key(query, content_type))
+            if not entry or page not in entry["pages"]:
+                return None
+            self.queries.move_to_end(self.key(query, content_type))
+            movies, details = entry["pages"][page]
+            return movies, details, entry["total_pages"]
+
+    def prefix_results(self, query, content_type):
+        """
+        Provisional answer for a query that hasn't been fetched yet: the first
+        page of the longest cached prefix ("batm" for "batman"), filtered down
+        to titles containing every word typed so far.
+        :return: (movies, details) or None if no prefix is cached.
+        """
+        _, normalized = self.key(query, content_type)
+        words = normalized.split()
+        with self.lock:
+            for length in range(len(normalized) - 1, 0, -1):
+                entry = self.queries.get((content_type, normalized[:length]))
+                if entry and 1 in entry["pages"]:
+                    movies, details = entry["pages"][1]
+                    break
+            else:
+                return None
+
+        matches = [
+            (movie, movie_details) for movie, movie_details in zip(movies, details)
+            if all(word in (movie.get("title") or movie.get("name") or "").lower() for word in words)
+        ]
+        return [movie for movie, _ in matches], [movie_details for _, movie_details in matches]
+
+    def put(self, query, content_type, page, movies, details, total_pages):
+        key = self.key(query, content_type)
+        with self.lock:
+            entry = self.queries.setdefault(key, {"total_pages": total_pages, "pages": {}})
+            entry["total_pages"] = total_pages
+            if page in entry["pages"] or len(entry["pages"]) < self.max_pages:
+                entry["pages"][page] = (movies, details)
+            self.queries.move_to_end(key)
+            while len(self.queries) > self.max_queries:
+                self.queries.popitem(last=False)
+
+
+search_page_cache = SearchPageCache()
+
+
+class SearchCursor:
+    """
+    Walks the result pages of one search, one page per fetch_next().
+    Hits already returned by an earlier page are skipped, TMDB rankings shift
+    slightly between requests.
+    """
+
+    def __init__(self, query, content_type="movie", page_cache=search_page_cache):
+        self.query = query
+        self.content_type = content_type
+        self.page_cache = page_cache
+        self.next_page = 1
+        self.total_pages = None  # Unknown until the first page arrives
+        self.seen_ids = set()
+
+    @property
+    def has_more(self):
+        return self.total_pages is None or self.next_page <= self.total_pages
+
+    async def fetch_next(self):
+        """
+        Coroutine, run it on async_client.
+        :return: (movies, details) for the new hits of the next page, or None if the
+            page failed to load. The cursor stays on a failed page, so the next call retries it.
+        """
+        page = self.next_page
+        cached = self.page_cache.get(self.query, self.content_type, page)
+        if cached:
+            movies, details, total_pages = cached
+        else:
+            page_results = await async_client.fetch_search_page(self.query, self.content_type, page)
+            if page_results is None:
+                return None
+            movies, total_pages = page_results
+            details = await async_client.fetch_many_movie_details([movie.get("id") for movie in movies])
+            if movies:
+                self.page_cache.put(self.query, self.content_type, page, movies, details, total_pages)
+
+        self.total_pages = total_pages
+        self.next_page = page + 1
+
+        new_movies, new_details = [], []
+        for movie, movie_details in zip(movies, details):
+            if movie.get("id") in self.seen_ids:
+                continue
+            self.seen_ids.add(movie.get("id"))
+            new_movies.append(movie)
+            new_details.append(movie_details)
+        return new_movies, new_details
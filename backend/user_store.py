@@ -0,0 +1,125 @@
+import json
+import os
+import sqlite3
+import threading
+from backend.config import USERS_DB, USERS_FILE
+from backend.file_lock import database_lock
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    password TEXT NOT NULL,
+    email TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS migrations (
+    name TEXT PRIMARY KEY
+);
+"""
+
+
+class UserStore:
+    """
+    SQLite repository for user accounts, keyed by username.
+    Looked up accounts are cached in memory. The cache is dropped whenever
+    another connection (another CineBook instance) commits, which SQLite
+    reports through PRAGMA data_version. Sign-ups are single-row inserts, so
+    two of them can't overwrite each other.
+    """
+
+    def __init__(self, path=USERS_DB):
+        self.path = path
+        self.lock = threading.Lock()
+        self.cache = {}  # username -> account dict, None for known missing users
+        self.conn = None  # Opened on first use, not on import
+        self.data_version = None
+
+    def connection(self):
+        """The shared connection, call with the lock held."""
+        if self.conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                conn.executescript(SCHEMA)
+            self.conn = conn
+            self.data_version = self.current_data_version()
+        return self.conn
+
+    def current_data_version(self):
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def check_cache(self):
+        # data_version only changes for commits made by other connections
+        self.connection()
+        version = self.current_data_version()
+        if version != self.data_version:
+            self.cache.clear()
+            self.data_version = version
+
+    def get(self, username):
+        """:return: {"username", "password", "email"} or None if the user doesn't exist."""
+        with self.lock:
+            self.check_cache()
+            if username not in self.cache:
+                row = self.conn.execute(
+                    "SELECT username, password, email FROM users WHERE username = ?", (username,)
+                ).fetchone()
+                self.cache[username] = dict(row) if row else None
+            account = self.cache[username]
+            return dict(account) if account else None
+
+    def exists(self, username):
+        return self.get(username) is not None
+
+    def add(self, username, password, email):
+        """:return: False if the username is already taken."""
+        with self.lock:
+            conn = self.connection()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT INTO users (username, password, email) VALUES (?, ?, ?)",
+                        (username, password, email),
+                    )
+            except sqlite3.IntegrityError:
+                self.cache.pop(username, None)
+                return False
+            self.cache[username] = {"username": username, "password": password, "email": email}
+            return True
+
+    def migrate_json_file(self, users_file=USERS_FILE):
+        """One-time import of the old users.json, skipped once it succeeded."""
+        if not os.path.exists(users_file):
+            return
+
+        with database_lock, self.lock:
+            conn = self.connection()
+            if conn.execute("SELECT 1 FROM migrations WHERE name = 'users_json'").fetchone():
+                return
+            try:
+                with open(users_file, "r") as file:
+                    users = json.load(file)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Skipping users file {users_file}: {e}")
+                return
+
+            # Only a {username: account} mapping holds accounts
+            if not isinstance(users, dict):
+                users = {}
+
+            with conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO users (username, password, email) VALUES (?, ?, ?)",
+                    [
+                        (username, account.get("password", ""), account.get("email", ""))
+                        for username, account in users.items() if isinstance(account, dict)
+                    ],
+                )
+                conn.execute("INSERT INTO migrations (name) VALUES ('users_json')")
+            self.cache.clear()
+            print(f"Migrated {len(users)} user accounts")
+
+
+# Opened on first use, MovieApp runs the JSON migration
+user_store = UserStore()
@@ -0,0 +1,80 @@
+import os
+import numpy as np
+
+
+class IVFIndex:
+    """
+    Approximate nearest neighbour search over normalized embeddings (inverted file).
+    Vectors are clustered with spherical k-means; a query only scores the
+    vectors of its nprobe closest clusters instead of the whole catalog.
+    Rows are stored sorted by cluster, offsets[c]:offsets[c + 1] is cluster c.
+    """
+
+    def __init__(self, centroids, vectors, ids, offsets):
+        self.centroids = centroids
+        self.vectors = vectors
+        self.ids = ids
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, ids, vectors, nlist=None, iterations=10, seed=0):
+        """
+        :param ids: Movie ID per row.
+        :param vectors: (n, dim) normalized float32 embeddings.
+        :param nlist: Number of clusters, about sqrt(n) by default.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        count = len(ids)
+        if count == 0:
+            raise ValueError("Cannot build an index without vectors")
+        nlist = min(count, nlist or max(1, int(np.sqrt(count))))
+
+        rng = np.random.default_rng(seed)
+        centroids = vectors[rng.choice(count, nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, vectors)
+            sizes = np.bincount(assignment, minlength=nlist)
+            # Empty clusters keep their old centroid
+            filled = sizes > 0
+            norms = np.linalg.norm(sums[filled], axis=1, keepdims=True)
+            centroids[filled] = sums[filled] / np.maximum(norms, 1e-12)
+
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        order = np.argsort(assignment, kind="stable")
+        offsets = np.searchsorted(assignment[order], np.arange(nlist + 1))
+        return cls(centroids, vectors[order], ids[order], offsets)
+
+    def search(self, query, k, nprobe=8):
+        """
+        :param query: Normalized query embedding.
+        :return: (ids, scores) of up to k nearest vectors by cosine similarity, best first.
+        """
+        nprobe = min(nprobe, len(self.centroids))
+        cluster_scores = self.centroids @ query
+        probe = np.argpartition(-cluster_scores, nprobe - 1)[:nprobe]
+        rows = np.concatenate([np.arange(self.offsets[c], self.offsets[c + 1]) for c in probe])
+        if len(rows) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        scores = self.vectors[rows] @ query
+        k = min(k, len(rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return self.ids[rows[top]], scores[top]
+
+    def save(self, path):
+        # np.savez adds .npz to names without it, so keep the suffix on the temp file
+        temp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(temp_path, centroids=self.centroids, vectors=self.vectors, ids=self.ids, offsets=self.offsets)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["centroids"], data["vectors"], data["ids"], data["offsets"])
@@ -1,18 +1,19 @@
 import customtkinter as ctk
 from CTkMessagebox import CTkMessagebox
-from PIL import Image, ImageTk
-import requests
-import json
-import io
+from PIL import ImageTk
 import os
 from tkinter import StringVar, IntVar
 from pytablericons import TablerIcons, OutlineIcon
 from backend.api_handler import APIHandler
+from backend.collection_model import collection_model
+from backend.config import POSTER_SIZE
+from backend.poster_cache import submit_poster_thumbnail
+from frontend.components.ui_dispatcher import UIDispatcher
 
 IMAGES_FOLDER = "backend/database/movie_images"
 
 class MovieContainer(ctk.CTkFrame):
-    def __init__(self, parent, movie_id, username=None, initial_status="To Watch", initial_rating=0, initial_notes="", show_buttons=None, controller=None, custom_data=None):
+    def __init__(self, parent, movie_id=None, username=None, initial_status="To Watch", initial_rating=0, initial_notes="", show_buttons=None, controller=None, custom_data=None, movie_data=None):
         super().__init__(parent, fg_color="#1E1E1E", corner_radius=10, width=200, height=380)
 
          # Force the widget to maintain its size
@@ -20,7 +21,7 @@ class MovieContainer(ctk.CTkFrame):
         self.pack_propagate(False)
 
         
-        self.movie_id = movie_id
+        self.movie_id = None
         self.username = username
         self.status_var = StringVar(value=initial_status)
         self.rating_var = IntVar(value=initial_rating)
@@ -28,12 +29,34 @@ class MovieContainer(ctk.CTkFrame):
         self.show_buttons = show_buttons or []  # Default to an empty list if None is passed
         self.movie_data = None
         self.controller = controller
-        self.custom_data = custom_data
+        self.custom_data = None
+        self.custom_id = None
         self.liked_var = IntVar(value=0) 
-        if custom_data:
-            self.custom_movie_title= custom_data.get("title", "")
+        self.poster_future = None  # Pending poster load, cancelled if the card goes away
+        self.bind_token = 0  # Bumped on every bind so late results for the old movie are ignored
+        self.destroyed = False
+        self.select_box = None  # Multi-select checkbox, created on first use
+        self.select_command = None
 
-        self.fetch_and_display_movie()
+        # Flag to track if the dropdown window is already open
+        self.dropdown_window = None
+        self.details_dropdown_window = None 
+
+        # Widgets are built once, bind_movie() only changes what they show so
+        # grids can recycle cards instead of rebuilding them
+        self.add_placeholder_image()
+
+        self.title_label = ctk.CTkLabel(
+            self,
+            text="",
+            text_color="white",
+            wraplength=200,
+            font=("Arial", 14, "bold")
+        )
+        self.title_label.pack(pady=(5, 5))
+
+        self.create_details_menu()
+        self.create_dropdown_menu()
 
         rating_frame = ctk.CTkFrame(self, fg_color="transparent")
         rating_frame.pack(fill="x", padx=10)
@@ -42,15 +65,35 @@ class MovieContainer(ctk.CTkFrame):
         # Add star rating display
         if "update" in self.show_buttons:
             self.create_star_rating(rating_frame)
-            
 
+        if movie_id is not None:
+            self.bind_movie(movie_id, username, initial_status, initial_rating, initial_notes, custom_data, movie_data)
 
 
-        # Flag to track if the dropdown window is already open
-        self.dropdown_window = None
-        self.details_dropdown_window = None 
+    def bind_movie(self, movie_id, username=None, initial_status="To Watch", initial_rating=0, initial_notes="", custom_data=None, movie_data=None):
+        """Show another movie in this card, reusing its widgets."""
+        self.bind_token += 1
+        if self.poster_future:
+            self.poster_future.cancel()
+            self.poster_future = None
 
-       
+        # Windows opened for the previous movie would edit the wrong entry
+        for window in (self.dropdown_window, self.details_dropdown_window):
+            if window and window.winfo_exists():
+                window.destroy()
+
+        self.movie_id = movie_id
+        if username is not None:
+            self.username = username
+        self.status_var.set(initial_status)
+        self.rating_var.set(initial_rating)
+        self.notes_var.set(initial_notes)
+        self.custom_data = dict(custom_data) if custom_data else None  # Edited in place by the title field
+        self.movie_data = movie_data  # Details prefetched by the page, if any
+        # Custom movies are identified by their generated custom_id, the title can change
+        self.custom_id = custom_data.get("custom_id") if custom_data else None
+
+        self.fetch_and_display_movie()
 
 
     def fetch_and_display_movie(self):
@@ -59,9 +102,10 @@ class MovieContainer(ctk.CTkFrame):
             self.display_custom_movie()
             return
             
-        self.fetch_movie_data()
         if self.movie_data:
             self.display_tmdb_movie()
+        else:
+            self.fetch_movie_data()
 
     def display_custom_movie(self):
         # Display custom movie poster (if provided) or placeholder
@@ -80,42 +124,18 @@ class MovieContainer(ctk.CTkFrame):
         if full_poster_path and  os.path.exists(full_poster_path):
             self.add_movie_image(full_poster_path)
         else:
-            self.add_placeholder_image()
+            self.show_placeholder()
 
         # Display movie title and year
         title = self.custom_data.get("title", "Unknown Title")
-        # release_date = self.custom_data.get("release_date", "Unknown")
-        self.title_label = ctk.CTkLabel(
-            self, 
-            text=f"{title}",
-            text_color="white",
-            wraplength=200,
-            font=("Arial", 14, "bold")
-        )
-        self.title_label.pack(pady=(5, 5))
-
-        
-        
-
-        self.create_details_menu()
-        self.create_dropdown_menu()
+        self.title_label.configure(text=f"{title}")
 
 
     def display_tmdb_movie(self):
         self.add_movie_image(self.movie_data.get("poster_path"))
 
         title = self.movie_data.get("title", "Unknown Title")
-        self.title_label = ctk.CTkLabel(
-            self,
-            text=f"{title}",
-            text_color="white",
-            wraplength=200,
-            font=("Arial", 14, "bold")
-        )
-        self.title_label.pack(pady=(5, 5))
-
-        self.create_details_menu()
-        self.create_dropdown_menu()
+        self.title_label.configure(text=f"{title}")
 
 
     def add_placeholder_image(self):
@@ -128,44 +148,99 @@ class MovieContainer(ctk.CTkFrame):
             font=("Arial", 12)
         )
         placeholder_text.place(relx=0.5, rely=0.5, anchor="center")
+        self.placeholder = placeholder
+
+        # The poster is laid over the placeholder once it has loaded
+        self.image_label = ctk.CTkLabel(placeholder, text="")
+
+    def show_placeholder(self):
+        self.image_label.place_forget()
 
 
     def fetch_movie_data(self):
-        """Fetch movie details using the updated APIHandler."""
-        self.movie_data = APIHandler.fetch_movie_details(self.movie_id)
+        """Fetch movie details on the APIHandler pool and fill the card in when they arrive."""
+        self.show_placeholder()
+        self.title_label.configure(text="Loading...")
+        token = self.bind_token
+        future = APIHandler.submit_movie_details(self.movie_id)
+        UIDispatcher.watch(future, lambda data: self.on_movie_data(data, token))
+
+    def on_movie_data(self, data, token):
+        if self.destroyed or token != self.bind_token:
+            return
+        self.movie_data = data
         if not self.movie_data:
             print(f"Failed to fetch data for movie ID {self.movie_id}.")
+            self.title_label.configure(text="Unknown Title")
+            return
+        self.display_tmdb_movie()
 
 
     def add_movie_image(self, poster_path):
-        """Load and display the movie poster."""
-        try:
-            if poster_path.startswith("/"):
-                # Remote URL
-                image_url = f"https://image.tmdb.org/t/p/w500{poster_path}"
-                response = requests.get(image_url)
-                response.raise_for_status()
-                image_data = response.content
-            else:
-                # Local file
-                print(poster_path)
-                if not os.path.exists(poster_path):
-                    print(f"Local file not found: {poster_path}")
-                    self.add_placeholder_image()
-                    return
-                with open(poster_path, "rb") as file:
-                    image_data = file.read()
-
-            # Process and display the image
-            image = Image.open(io.BytesIO(image_data))
-            image = image.resize((180, 270), Image.LANCZOS)
-            photo = ImageTk.PhotoImage(image)
-            self.image_label = ctk.CTkLabel(self, image=photo, text="")
-            self.image_label.image = photo
-            self.image_label.pack(pady=(10, 5))
-        except Exception as e:
-            print(f"Error loading image: {e}")
-            self.add_placeholder_image()
+        """Show the placeholder right away and swap the poster in once it has loaded."""
+        self.show_placeholder()
+        if not poster_path:
+            return
+
+        if not poster_path.startswith("/") and not os.path.exists(poster_path):
+            # Local file
+            print(f"Local file not found: {poster_path}")
+            return
+
+        # Download/decode runs on the poster pool, extra pixels on HiDPI screens
+        # so CTkImage doesn't upscale
+        scale = ctk.ScalingTracker.get_widget_scaling(self)
+        token = self.bind_token
+        self.poster_future = submit_poster_thumbnail(poster_path, POSTER_SIZE, scale)
+        UIDispatcher.watch(self.poster_future, lambda image: self.show_poster(image, token))
+
+    def show_poster(self, image, token):
+        """Runs on the Tk thread when the thumbnail is ready."""
+        if self.destroyed or token != self.bind_token or image is None:
+            return
+        self.poster_future = None
+        photo = ctk.CTkImage(light_image=image, dark_image=image, size=POSTER_SIZE)
+        self.image_label.configure(image=photo)
+        self.image_label.image = photo
+        self.image_label.place(relx=0, rely=0, relwidth=1, relheight=1)
+
+    def set_selectable(self, selectable, selected=False, command=None):
+        """
+        Show or hide the multi-select checkbox in the top left corner.
+        :param command: Called with True/False when the user toggles it.
+        """
+        if not selectable:
+            if self.select_box:
+                self.select_box.place_forget()
+            self.show_selected(False)
+            return
+
+        if self.select_box is None:
+            self.select_var = IntVar(value=0)
+            self.select_box = ctk.CTkCheckBox(
+                self, text="", width=24, variable=self.select_var,
+                fg_color="#FFD700", hover_color="#FFBF00", command=self.on_select_toggle
+            )
+        self.select_command = command
+        self.select_var.set(1 if selected else 0)
+        self.show_selected(selected)
+        self.select_box.place(x=8, y=8)
+        self.select_box.lift()
+
+    def on_select_toggle(self):
+        selected = bool(self.select_var.get())
+        self.show_selected(selected)
+        if self.select_command:
+            self.select_command(selected)
+
+    def show_selected(self, selected):
+        self.configure(border_width=2 if selected else 0, border_color="#FFD700")
+
+    def destroy(self):
+        self.destroyed = True
+        if self.poster_future:
+            self.poster_future.cancel()
+        super().destroy()
 
 
     def create_details_menu(self):
@@ -183,6 +258,9 @@ class MovieContainer(ctk.CTkFrame):
 
     def show_details_dropdown(self):
         """Display comprehensive dropdown menu for movie/TV show details."""
+        if not self.movie_data:
+            return  # Details haven't arrived (yet)
+
         if self.details_dropdown_window and self.details_dropdown_window.winfo_exists():
             self.details_dropdown_window.lift()
             return
@@ -353,7 +431,9 @@ class MovieContainer(ctk.CTkFrame):
         
         def update_rating_label(*args):
             self.rating_label.configure(text=str(self.rating_var.get()))
-        self.rating_var.trace_add("write", update_rating_label)
+        trace_id = self.rating_var.trace_add("write", update_rating_label)
+        # Recycled cards keep their variables, so drop the trace with the window
+        self.dropdown_window.bind("<Destroy>", lambda e: self.rating_var.trace_remove("write", trace_id) if e.widget is self.dropdown_window else None, add="+")
 
         # Watch status
         status_label = ctk.CTkLabel(self.dropdown_window, text="Status:", text_color="white")
@@ -411,7 +491,7 @@ class MovieContainer(ctk.CTkFrame):
 
 
     def save_data(self):
-        """Save the movie data to the JSON file and show a confirmation message."""
+        """Save the movie to the user's collection and show a confirmation message."""
         if not self.username:
             CTkMessagebox(
                 title="Error",
@@ -421,47 +501,21 @@ class MovieContainer(ctk.CTkFrame):
             )
             return
 
-        # Ensure directory exists
-        user_data_dir = os.path.join("backend/database/user_movie_data")
-        os.makedirs(user_data_dir, exist_ok=True)
-            
-        user_file = os.path.join(user_data_dir, f"{self.username}.json")
-
         try:
-                # Load current data
-                user_data = []
-                if os.path.exists(user_file):
-                    with open(user_file, "r") as file:
-                        try:
-                            user_data = json.load(file)
-                            if not isinstance(user_data, list):
-                                user_data = []
-                        except json.JSONDecodeError:
-                            print(f"Error reading JSON file: {user_file}")
-                            user_data = []
-
-                # Update or add movie data
                 movie_data = {
                     "movie_id": self.movie_id,
                     "status": self.status_var.get(),
                     "rating": self.rating_var.get(),
                     "notes": self.notes_var.get(),
                 }
+                # Keep title and genres so the collection can be searched without TMDB
+                if self.movie_data:
+                    movie_data["title"] = self.movie_data.get("title") or self.movie_data.get("name", "")
+                    movie_data["genres"] = [{"name": genre.get("name")} for genre in self.movie_data.get("genres", [])]
 
-                # Find and update existing movie or append new one
-                updated = False
-                for i, movie in enumerate(user_data):
-                    if movie.get("movie_id") == self.movie_id:
-                        user_data[i] = movie_data
-                        updated = True
-                        break
-
-                if not updated:
-                    user_data.append(movie_data)
-
-                # Save updated data
-                with open(user_file, "w") as file:
-                    json.dump(user_data, file, indent=4)
+                # Replaces the existing entry for this movie, if any. The write is
+                # queued and the collection page refreshes once it lands
+                collection_model.upsert(self.username, movie_data)
 
                 print(f"Data saved for movie {self.movie_id}")
 
@@ -473,15 +527,6 @@ class MovieContainer(ctk.CTkFrame):
                     option_1="Close"
                 )
 
-                # Refresh the collection page if controller exists
-                if hasattr(self, 'controller') and self.controller is not None:
-                    if "MyCollectionsPage" in self.controller.frames:
-                        self.controller.frames["MyCollectionsPage"].refresh_movies()
-                    else:
-                        print("MyCollectionsPage not found in controller frames")
-                else:
-                    print("Controller not properly initialized")
-
         except Exception as e:
                 print(f"Failed to save data: {e}")
                 CTkMessagebox(
@@ -502,29 +547,8 @@ class MovieContainer(ctk.CTkFrame):
         )
 
         if msg.get() == "Delete":
-            user_file = os.path.join("backend/database/user_movie_data", f"{self.username}.json")
-            
             try:
-                with open(user_file, "r") as file:
-                    user_data = json.load(file)
-                
-                # For custom movies (movie_id == -1), check by title
-                if self.movie_id == -1:
-                    user_data = [movie for movie in user_data 
-                            if not (movie.get("movie_id") == -1 and 
-                                    movie.get("title") == self.movie_data.get("title"))]
-                else:
-                    # For regular movies, check by movie_id
-                    user_data = [movie for movie in user_data 
-                            if movie.get("movie_id") != self.movie_id]
-                
-                # Save the updated data
-                with open(user_file, "w") as file:
-                    json.dump(user_data, file, indent=4)
-                
-              
-                
-                self.controller.frames["MyCollectionsPage"].refresh_movies()
+                collection_model.delete(self.username, self.movie_id, self.custom_id)
 
                 success_msg = CTkMessagebox(
                     title="Deleted",
@@ -543,66 +567,32 @@ class MovieContainer(ctk.CTkFrame):
 
 
     def update_data(self):
-        """Update the movie data in the JSON file."""
+        """Update the movie data in the user's collection."""
         # Retrieve the latest values directly from the UI elements
         updated_status = self.status_var.get()
         updated_rating = self.rating_var.get()
         updated_notes = self.notes_var.get()
         updated_title = self.custom_data.get("title", "") if self.custom_data else None
 
-        print(f"Updated Status: {updated_status}") 
-        print(f"Updated Rating: {updated_rating}") 
-        print(f"Updated Notes: {updated_notes}") 
-        print(f"Updated Title: {updated_title}")
-
-        user_file = os.path.join("backend/database/user_movie_data", f"{self.username}.json")
-
-        # Load current data
-        if os.path.exists(user_file):
-            with open(user_file, "r") as file:
-                try:
-                    user_data = json.load(file)
-                except json.JSONDecodeError:
-                    user_data = []
-        else:
-            CTkMessagebox(title="Error", message="No data found to update!", icon="warning")
-            return
-
-        # Check if movie exists and update its data
-        updated = False
-        for movie in user_data:
-             # For custom movies (movie_id == -1), check by title
-            if self.movie_id == -1:
-                if movie.get("movie_id") == -1 and movie.get("title") == self.custom_movie_title:
-                    movie.update({
-                        "status": updated_status,
-                        "rating": updated_rating,
-                        "notes": updated_notes,
-                        "title": updated_title,
-                    })
-                    updated = True
-                    break
-            else:
-                # For regular movies, check by movie_id
-                if movie.get("movie_id") == self.movie_id:
-                    movie.update({
-                        "status": updated_status,
-                        "rating": updated_rating,
-                        "notes": updated_notes
-                    })
-                    updated = True
-                    break
-
-
-        if updated:
-            # Save the updated data to the JSON file
-            with open(user_file, "w") as file:
-                json.dump(user_data, file, indent=4)
-            
-            # Refresh the collection page
-            self.controller.frames["MyCollectionsPage"].refresh_movies()
-
-            CTkMessagebox(title="Updated", message="Movie data updated successfully!", icon="check")
+        changes = {
+            "status": updated_status,
+            "rating": updated_rating,
+            "notes": updated_notes,
+        }
+        if self.movie_id == -1:
+            if not updated_title.strip():
+                CTkMessagebox(title="Error", message="Title is required!", icon="warning")
+                return
+            if collection_model.custom_title_taken(updated_title, exclude_key=collection_model.key(self.custom_data)):
+                CTkMessagebox(title="Error", message="Another custom movie already has this title!", icon="warning")
+                return
+            changes["title"] = updated_title
+
+        if collection_model.update(self.username, self.movie_id, changes, self.custom_id) is not None:
+            # The write is queued and coalesced with further edits, the collection
+            # page refreshes once per written batch instead of after every update
+            if self.dropdown_window and self.dropdown_window.winfo_exists():
+                self.dropdown_window.destroy()
         else:
             CTkMessagebox(title="Error", message="Movie not found to update!", icon="warning")
         
@@ -1,6 +1,7 @@
 import customtkinter as ctk
 from PIL import Image, ImageTk
 from pytablericons import TablerIcons, OutlineIcon
+from backend.collection_writer import collection_writer
 
 class Sidebar(ctk.CTkFrame):
     def __init__(self, parent, controller):
@@ -114,6 +115,8 @@ class Sidebar(ctk.CTkFrame):
             self.buttons[self.active_page]['indicator'].pack_forget()
             self.buttons[self.active_page]['button'].configure(fg_color="black")
         self.active_page = None
+        # Write queued collection edits before the session ends
+        collection_writer.flush()
         self.controller.show_frame("LoginPage")
 
 
@@ -0,0 +1,54 @@
+import queue
+
+
+class UIDispatcher:
+    """
+    Hands results from worker threads and the async client back to the Tk thread.
+    Tk widgets must only be touched from the mainloop thread, so callbacks are
+    queued here and drained by an after() loop on the root window.
+    """
+
+    callbacks = queue.SimpleQueue()
+    root = None
+    interval = 30  # ms
+
+    @classmethod
+    def attach(cls, root):
+        """Start draining the queue from root's mainloop. Call once from MovieApp."""
+        cls.root = root
+        cls.root.after(cls.interval, cls.poll)
+
+    @classmethod
+    def post(cls, callback, *args):
+        """Run callback(*args) on the Tk thread. Safe to call from any thread."""
+        cls.callbacks.put((callback, args))
+
+    @classmethod
+    def watch(cls, future, callback):
+        """Call callback(result) on the Tk thread once a concurrent future finishes."""
+        def done(finished):
+            if finished.cancelled():
+                return
+            try:
+                result = finished.result()
+            except Exception as e:
+                print(f"Background task failed: {e}")
+                result = None
+            cls.post(callback, result)
+
+        future.add_done_callback(done)
+        return future
+
+    @classmethod
+    def poll(cls):
+        try:
+            while True:
+                callback, args = cls.callbacks.get_nowait()
+                try:
+                    callback(*args)
+                except Exception as e:
+                    # A card or page may have been destroyed before its result arrived
+                    print(f"Error in UI callback: {e}")
+        except queue.Empty:
+            pass
+        cls.root.after(cls.interval, cls.poll)
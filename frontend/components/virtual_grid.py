@@ -0,0 +1,161 @@
+import customtkinter as ctk
+
+
+class VirtualGrid(ctk.CTkFrame):
+    """
+    Scrollable grid of fixed-size cards that only materializes the rows in and
+    near the viewport. Card widgets come from a pool: when a row scrolls out of
+    view its cards are hidden and rebound to whatever item scrolls in next.
+
+    :param create_card: Callable(parent) returning a new, empty card widget.
+    :param bind_card: Callable(card, item) that points a card at an item.
+    :param on_near_end: Optional callable, called when the last row comes near the viewport.
+    """
+
+    def __init__(self, parent, create_card, bind_card, card_width=200, card_height=380,
+                 padx=18, pady=20, overscan_rows=1, empty_text="No results found.", on_near_end=None):
+        super().__init__(parent, fg_color="black", border_color="black", border_width=1)
+        self.create_card = create_card
+        self.bind_card = bind_card
+        self.card_width = card_width
+        self.card_height = card_height
+        self.padx = padx
+        self.pady = pady
+        self.overscan_rows = overscan_rows
+        self.empty_text = empty_text
+        self.on_near_end = on_near_end
+
+        self.items = []
+        self.columns = 1
+        self.bound = {}  # item index -> card currently showing it
+        self.free_cards = []  # hidden cards ready to be rebound
+        self.windows = {}  # card -> canvas window id
+        self.refresh_pending = None
+        self.relayout_pending = None
+
+        self.canvas = ctk.CTkCanvas(self, bg="black", highlightthickness=0)
+        self.scrollbar = ctk.CTkScrollbar(self, orientation="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self.on_scroll)
+
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.empty_label = ctk.CTkLabel(self.canvas, text=empty_text, text_color="white")
+        self.empty_window = self.canvas.create_window(20, 20, window=self.empty_label, anchor="nw", state="hidden")
+
+        self.canvas.bind("<Configure>", self.on_canvas_resize)
+
+    def scaled(self, value):
+        return int(value * ctk.ScalingTracker.get_widget_scaling(self))
+
+    def cell_size(self):
+        return (
+            self.scaled(self.card_width) + 2 * self.padx,
+            self.scaled(self.card_height) + 2 * self.pady,
+        )
+
+    def set_items(self, items, empty_text=None):
+        """Show a new list of items, reusing the existing card widgets."""
+        self.items = list(items)
+        for index in list(self.bound):
+            self.release(index)
+
+        self.empty_label.configure(text=empty_text or self.empty_text)
+        self.canvas.itemconfigure(self.empty_window, state="normal" if not self.items else "hidden")
+        self.canvas.yview_moveto(0)
+        self.relayout()
+
+    def update_items(self, items, empty_text=None):
+        """
+        Replace the items but keep the scroll position. Only cards whose item
+        changed (or moved to another index) are rebound.
+        """
+        old_items = self.items
+        self.items = list(items)
+        for index in list(self.bound):
+            if index >= len(self.items) or self.items[index] != old_items[index]:
+                self.release(index)
+
+        self.empty_label.configure(text=empty_text or self.empty_text)
+        self.canvas.itemconfigure(self.empty_window, state="normal" if not self.items else "hidden")
+        self.relayout()
+
+    def append_items(self, items):
+        """Add items at the end (next result page) without touching the cards already shown."""
+        self.items.extend(items)
+        if self.items:
+            self.canvas.itemconfigure(self.empty_window, state="hidden")
+        self.relayout()
+
+    def on_canvas_resize(self, event=None):
+        # Window drags fire dozens of events, only re-grid once they settle
+        if self.relayout_pending:
+            self.after_cancel(self.relayout_pending)
+        self.relayout_pending = self.after(100, self.relayout)
+
+    def relayout(self):
+        """
+        Re-grid for the current width. Bound cards keep their data and are only
+        moved, new cards are bound only for rows that just became visible.
+        """
+        self.relayout_pending = None
+        cell_width, cell_height = self.cell_size()
+        columns = max(1, self.canvas.winfo_width() // cell_width)
+        rows = -(-len(self.items) // columns)
+        self.canvas.configure(scrollregion=(0, 0, columns * cell_width, max(rows * cell_height, 1)))
+
+        if columns != self.columns:
+            self.columns = columns
+            for index, card in self.bound.items():
+                self.place_card(index, card)
+        self.refresh()
+
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if self.refresh_pending is None:
+            self.refresh_pending = self.after_idle(self.refresh)
+
+    def visible_range(self):
+        cell_height = self.cell_size()[1]
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first_row = max(0, int(top // cell_height) - self.overscan_rows)
+        last_row = int(bottom // cell_height) + self.overscan_rows
+        return first_row * self.columns, min(len(self.items), (last_row + 1) * self.columns)
+
+    def refresh(self):
+        """Bind cards for the visible rows and recycle the ones that scrolled away."""
+        self.refresh_pending = None
+        start, end = self.visible_range()
+
+        for index in list(self.bound):
+            if not start <= index < end:
+                self.release(index)
+
+        for index in range(start, end):
+            if index in self.bound:
+                continue
+            card = self.free_cards.pop() if self.free_cards else self.new_card()
+            self.bind_card(card, self.items[index])
+            self.bound[index] = card
+            self.place_card(index, card)
+
+        if self.on_near_end and self.items and end >= len(self.items):
+            self.on_near_end()
+
+    def new_card(self):
+        card = self.create_card(self.canvas)
+        self.windows[card] = self.canvas.create_window(0, 0, window=card, anchor="nw", state="hidden")
+        return card
+
+    def place_card(self, index, card):
+        cell_width, cell_height = self.cell_size()
+        row, col = divmod(index, self.columns)
+        window = self.windows[card]
+        self.canvas.coords(window, col * cell_width + self.padx, row * cell_height + self.pady)
+        self.canvas.itemconfigure(window, state="normal")
+
+    def release(self, index):
+        card = self.bound.pop(index)
+        self.canvas.itemconfigure(self.windows[card], state="hidden")
+        self.free_cards.append(card)
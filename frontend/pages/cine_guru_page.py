@@ -1,6 +1,9 @@
 import customtkinter as ctk
+from backend.async_client import async_client
 from backend.cine_guru_backend import CineGuruBackend
 from frontend.components.movie_card import MovieContainer
+from frontend.components.ui_dispatcher import UIDispatcher
+from frontend.components.virtual_grid import VirtualGrid
 from PIL import Image, ImageTk
 from pytablericons import TablerIcons, OutlineIcon
 
@@ -11,6 +14,8 @@ class CineGuruPage(ctk.CTkFrame):
 
         # Initialize backend
         self.backend = CineGuruBackend()
+        self.request_id = 0  # Bumped per prompt, results of older prompts are dropped
+        self.recommend_future = None
 
         # Left line
         self.left_line = ctk.CTkCanvas(self, width=1, bg="white", highlightthickness=0)
@@ -49,76 +54,61 @@ class CineGuruPage(ctk.CTkFrame):
                                               command=self.get_recommendations, corner_radius=20)
         self.recommend_button.grid(row=0, column=1, padx=5)
 
-        # Scrollable container
-        self.results_frame = ctk.CTkFrame(self, fg_color="black")
-        self.results_frame.pack(fill="both", expand=True, pady=20, padx=20)
-
-        self.canvas = ctk.CTkCanvas(self.results_frame, bg="black", highlightthickness=0)
-        self.scrollbar = ctk.CTkScrollbar(self.results_frame, orientation="vertical", command=self.canvas.yview)
-        self.scrollable_inner_frame = ctk.CTkFrame(self.canvas, fg_color="black")
-
-        self.scrollable_inner_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        )
-
-        self.canvas.create_window((0, 0), window=self.scrollable_inner_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
-
-        self.canvas.pack(side="left", fill="both", expand=True)
-        self.scrollbar.pack(side="right", fill="y")
+        # Virtualized grid of recycled movie cards
+        self.movie_grid = VirtualGrid(self, create_card=self.create_card, bind_card=self.bind_card)
+        self.movie_grid.pack(fill="both", expand=True, pady=20, padx=20)
 
     def get_recommendations(self):
         """
         Fetch user input, get recommendations from the backend, and display them in the UI.
+        The work runs on the async client, the window stays responsive meanwhile.
         """
         user_input = self.user_input_entry.get()
-        current_user = self.controller.current_user
 
-        # Call the backend method to get movie recommendations
-        recommendations = self.backend.recommend_movies(user_input)
+        self.request_id += 1
+        request_id = self.request_id
+        if self.recommend_future:
+            self.recommend_future.cancel()  # Superseded by the new prompt
+        self.recommend_future = async_client.submit(self.load_recommendations(user_input))
+        UIDispatcher.watch(self.recommend_future, lambda result: self.on_recommendations(request_id, result))
 
-        # Clear previous results
-        for widget in self.scrollable_inner_frame.winfo_children():
-            widget.destroy()
+    async def load_recommendations(self, user_input):
+        """:return: (movie, details) pairs, or a message to show instead."""
+        recommendations = await self.backend.recommend(user_input)
 
         # If recommendations are returned as a list of tuples (score, movie), display them
-        if isinstance(recommendations, list):
-            row, col = 0, 0
-            widgets_per_row = self.calculate_widgets_per_row()
-
-            for score, movie in recommendations:
-                if col == widgets_per_row:
-                    col = 0
-                    row += 1
-
-                # Ensure movie_id is passed here
-                movie_id = movie.get('id')  # Ensure the 'id' field is available in the movie dictionary
-
-                if movie.get("movie_id"):  # Check if movie_id exists
-                    try:
-                        movie_id = movie.get("movie_id", "Unknown ID")  # Get the movie_id, default to "Unknown ID" if not found
-                        movie_container = MovieContainer(
-                            self.scrollable_inner_frame,
-                            movie_id=movie_id,  # Pass movie_id
-                            username=current_user,
-                            initial_status="To Watch",  # Example initial status
-                            initial_rating=0,  # Example initial rating
-                            initial_notes="",  # Example initial notes
-                            show_buttons=["save"],  # Example buttons
-                        )
-                        movie_container.grid(row=row, column=col, padx=18, pady=20)
-                        col += 1
-                    except Exception as e:
-                        print(f"Error creating MovieContainer for movie {movie}: {e}")
-                else:
-                    print(f"Error: No movie ID provided for movie: {movie}")
-
+        if not isinstance(recommendations, list):
+            return recommendations
+        movies = []
+        for score, movie in recommendations:
+            if movie.get("movie_id"):  # Check if movie_id exists
+                movies.append(movie)
+            else:
+                print(f"Error: No movie ID provided for movie: {movie}")
+
+        details = await async_client.fetch_many_movie_details([movie.get("movie_id") for movie in movies])
+        return list(zip(movies, details))
+
+    def on_recommendations(self, request_id, result):
+        if request_id != self.request_id:
+            return  # A newer prompt has been sent since
+        self.recommend_future = None
+        if isinstance(result, list):
+            self.movie_grid.set_items(result)
         else:
             # Display error or no results message
-            no_results_label = ctk.CTkLabel(self.scrollable_inner_frame, text=recommendations, text_color="white")
-            no_results_label.pack(pady=20)
-
-    def calculate_widgets_per_row(self):
-        window_width = self.winfo_width()
-        return max(1, window_width // 200)
\ No newline at end of file
+            self.movie_grid.set_items([], empty_text=result or "Something went wrong, please try again.")
+
+    def create_card(self, parent):
+        return MovieContainer(parent, show_buttons=["save"], controller=self.controller)
+
+    def bind_card(self, card, item):
+        movie, movie_details = item
+        card.bind_movie(
+            movie.get("movie_id"),
+            username=self.controller.current_user,
+            initial_status="To Watch",  # Example initial status
+            initial_rating=0,  # Example initial rating
+            initial_notes="",  # Example initial notes
+            movie_data=movie_details,
+        )
@@ -1,9 +1,15 @@
 import customtkinter as ctk
 from PIL import ImageTk
 from backend.api_handler import APIHandler
+from backend.async_client import async_client
+from backend.search_cache import SearchCursor, search_page_cache
 from frontend.components.movie_card import MovieContainer
+from frontend.components.ui_dispatcher import UIDispatcher
+from frontend.components.virtual_grid import VirtualGrid
 from pytablericons import TablerIcons, OutlineIcon
 
+SEARCH_DEBOUNCE_MS = 250
+
 
 class HomePage(ctk.CTkFrame):
     def __init__(self, parent, controller):
@@ -13,7 +19,13 @@ class HomePage(ctk.CTkFrame):
 
 
         self.movie_data = []  # Cache for movie data
-        self.resize_timer = None  # Timer for throttling resize events
+        self.movie_details = None  # Details resolved alongside movie_data
+        self.request_id = 0  # Bumped on every search so stale results are dropped
+        self.cursor = None  # Pages of the current search
+        self.loading_page = False
+        self.page_future = None  # In-flight page request, cancelled when a newer search starts
+        self.search_timer = None  # Debounce for type-ahead
+        self.current_query = None
 
         # Initialize APIHandler (no need to pass arguments anymore)
         self.api_handler = APIHandler
@@ -41,6 +53,7 @@ class HomePage(ctk.CTkFrame):
 
         self.search_entry = ctk.CTkEntry(center_frame, corner_radius=20, placeholder_text="Search...", width=300)
         self.search_entry.pack(side="left", padx=5)
+        self.search_entry.bind("<KeyRelease>", self.on_search_typed)
 
         self.search_button = ctk.CTkButton(
             center_frame, 
@@ -57,34 +70,18 @@ class HomePage(ctk.CTkFrame):
 
         self.setup_media_tabs()
 
-        # Container for movie posters
-        self.movies_container_frame = ctk.CTkFrame(self, fg_color="black", border_color="black", border_width=1)
-        self.movies_container_frame.pack(fill="both", expand=True, pady=20, padx=20)
-
-        # Adding a canvas and scrollbar
-        self.canvas = ctk.CTkCanvas(self.movies_container_frame, bg="black", highlightthickness=0)
-        self.scrollbar = ctk.CTkScrollbar(self.movies_container_frame, orientation="vertical", command=self.canvas.yview)
-        self.scrollable_frame = ctk.CTkFrame(self.canvas, fg_color="black")
-
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(
-                scrollregion=self.canvas.bbox("all")
-            )
+        # Virtualized grid of recycled movie cards, resizing only re-grids the existing ones
+        self.movie_grid = VirtualGrid(
+            self,
+            create_card=self.create_card,
+            bind_card=self.bind_card,
+            on_near_end=self.load_next_page,
         )
-
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
-
-        self.canvas.pack(side="left", fill="both", expand=True)
-        self.scrollbar.pack(side="right", fill="y")
+        self.movie_grid.pack(fill="both", expand=True, pady=20, padx=20)
 
         # Fetch and display top movies by default
         self.fetch_and_display_top_movies()
 
-        # Bind resizing event with throttling
-        self.bind("<Configure>", self.on_resize)
-
 
 
     def setup_media_tabs(self):
@@ -125,58 +122,88 @@ class HomePage(ctk.CTkFrame):
 
 
     def fetch_and_display_top_movies(self):
-        self.movie_data = self.api_handler.fetch_movies_by_query("movie")  # Fetch top movies
-        self.display_movies(self.movie_data)
+        self.load_movies("movie")  # Fetch top movies
+
+    def on_search_typed(self, event=None):
+        """Type-ahead: search once the user stops typing for a moment."""
+        if self.search_timer:
+            self.after_cancel(self.search_timer)
+        self.search_timer = self.after(SEARCH_DEBOUNCE_MS, self.search_typed_query)
+
+    def search_typed_query(self):
+        self.search_timer = None
+        search_query = self.search_entry.get().strip()
+        if search_query and search_query != self.current_query:
+            self.load_movies(search_query)
 
     def search_movies(self):
         search_query = self.search_entry.get()
         if search_query:  # Only perform search if query is not empty
-            self.movie_data = self.api_handler.fetch_movies_by_query(search_query)  # Fetch search results
-            self.display_movies(self.movie_data)
+            self.load_movies(search_query)  # Fetch search results
 
     def show_movies(self):
-        self.movie_data = self.api_handler.fetch_movies_by_query("movie")  # Fetch top movies
-        self.display_movies(self.movie_data)
+        self.load_movies("movie")  # Fetch top movies
 
     def show_tv_series(self):
-        self.movie_data = self.api_handler.fetch_movies_by_query("series")  # Fetch TV series
-        self.display_movies(self.movie_data)
-
-    def display_movies(self, movies):
-        # Clear previous results
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-
-        if not movies:
-            no_results_label = ctk.CTkLabel(self.scrollable_frame, text="No results found.", text_color="white")
-            no_results_label.pack(pady=20)
+        self.load_movies("series")  # Fetch TV series
+
+    def load_movies(self, query):
+        """Start a new search, pages are fetched on the async client without blocking the window."""
+        self.request_id += 1
+        if self.page_future:
+            self.page_future.cancel()  # Superseded, stop the request instead of just ignoring it
+        self.current_query = query
+        self.cursor = SearchCursor(query)
+        self.loading_page = False
+        self.movie_data = []
+        self.movie_details = []
+
+        # Show what a cached shorter prefix already knows while the real request runs
+        provisional = search_page_cache.prefix_results(query, self.cursor.content_type)
+        if provisional and provisional[0]:
+            self.display_movies(*provisional)
+
+        self.load_next_page()
+
+    def load_next_page(self):
+        """Fetch the next result page in the background, the grid calls this near its bottom."""
+        if self.loading_page or not self.cursor or not self.cursor.has_more:
             return
-
-        row, col = 0, 0
-        widgets_per_row = self.calculate_widgets_per_row()
-
-        for movie in movies:
-            if col == widgets_per_row:
-                col = 0
-                row += 1
-            if movie.get('id') is not None:
-            # Create MovieContainer for each movie instead of basic display
-                movie_container = MovieContainer(self.scrollable_frame, movie_id=movie.get('id'), username=self.controller.current_user, show_buttons=["save"], controller=self.controller )
-                movie_container.grid(row=row, column=col, padx=18, pady=20)
-
-            col += 1
-
-    def calculate_widgets_per_row(self):
-        window_width = self.winfo_width()
-        return max(1, window_width // 220)
-
-    def on_resize(self, event=None):
-        if self.resize_timer:
-            self.after_cancel(self.resize_timer)  # Cancel previous timer
-
-        self.resize_timer = self.after(300, self.update_layout)  # Delay layout update by 300ms
-
-    def update_layout(self):
-        if self.movie_data:  # Use cached movie data
-            self.display_movies(self.movie_data)
-
+        self.loading_page = True
+        request_id = self.request_id
+        first_page = self.cursor.next_page == 1
+        self.page_future = async_client.submit(self.cursor.fetch_next())
+        UIDispatcher.watch(self.page_future, lambda result: self.on_page_loaded(request_id, result, first_page))
+
+    def on_page_loaded(self, request_id, result, first_page):
+        if request_id != self.request_id:
+            return  # A newer search has been started since
+        self.loading_page = False
+        self.page_future = None
+        if result is None and not first_page:
+            return  # Failed page, scrolling again retries it
+        movies, details = result or ([], [])
+        self.movie_data.extend(movies)
+        self.movie_details.extend(details)
+
+        if first_page:
+            self.display_movies(movies, details)
+        else:
+            # Append the new cards, the ones already on screen stay as they are
+            self.movie_grid.append_items(self.grid_items(movies, details))
+
+    def display_movies(self, movies, details=None):
+        if details is None:
+            details = [None] * len(movies)  # Cards resolve their own details when bound
+
+        self.movie_grid.set_items(self.grid_items(movies, details))
+
+    def grid_items(self, movies, details):
+        return [(movie, movie_details) for movie, movie_details in zip(movies, details) if movie.get('id') is not None]
+
+    def create_card(self, parent):
+        return MovieContainer(parent, show_buttons=["save"], controller=self.controller)
+
+    def bind_card(self, card, item):
+        movie, movie_details = item
+        card.bind_movie(movie.get('id'), username=self.controller.current_user, movie_data=movie_details)
@@ -1,10 +1,8 @@
 import customtkinter as ctk
 from CTkMessagebox import CTkMessagebox
-import json
-import os
 from PIL import Image, ImageTk
 from pytablericons import TablerIcons, OutlineIcon
-from backend.config import USERS_FILE
+from backend.user_store import user_store
 
 class LoginPage(ctk.CTkFrame):
 
@@ -102,26 +100,14 @@ class LoginPage(ctk.CTkFrame):
         )
         self.sign_up_button.pack(pady=10)
 
-    def load_users(self):
-        """Load user credentials."""
-        if not os.path.exists(USERS_FILE):
-            with open(USERS_FILE, "w") as f:
-                json.dump({}, f)
-
-        try:
-            with open(USERS_FILE, "r") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            return {}
-
     def login_user(self):
         username = self.username_entry.get()
         password = self.password_entry.get()
 
-        users = self.load_users()
+        account = user_store.get(username)
 
-        if username in users:
-            if users[username]["password"] == password:
+        if account:
+            if account["password"] == password:
                 self.controller.set_current_user(username)
 
                 my_collections_page = self.controller.frames["MyCollectionsPage"]
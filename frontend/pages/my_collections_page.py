@@ -1,13 +1,16 @@
 import customtkinter as ctk
-import json
 import os
 import time
 import shutil
 from CTkMessagebox import CTkMessagebox
 from frontend.components.movie_card import MovieContainer
+from frontend.components.virtual_grid import VirtualGrid
 from pytablericons import TablerIcons, OutlineIcon
 from PIL import ImageTk
-from backend.config import USER_DATA_FOLDER, IMAGES_FOLDER
+from backend.collection_model import collection_model
+from backend.collection_writer import collection_writer
+from frontend.components.ui_dispatcher import UIDispatcher
+from backend.config import IMAGES_FOLDER
 
 
 class MyCollectionsPage(ctk.CTkFrame):
@@ -15,8 +18,10 @@ class MyCollectionsPage(ctk.CTkFrame):
     def __init__(self, parent, controller):
         super().__init__(parent, fg_color="black")
         self.controller = controller
-        self.resize_timer = None
         self.movie_data = []
+        self.selection_mode = False
+        self.selected = set()  # Entry keys of the selected movies
+        self.displayed_version = None  # collection_model.version currently on screen
 
 
         # Ensure images folder exists
@@ -48,6 +53,21 @@ class MyCollectionsPage(ctk.CTkFrame):
 
        
 
+        # Left section - Multi-select
+        left_frame = ctk.CTkFrame(self.top_frame, fg_color="black")
+        left_frame.grid(row=0, column=0, sticky="w")
+
+        self.select_button = ctk.CTkButton(
+            left_frame,
+            text="Select",
+            command=self.toggle_selection_mode,
+            fg_color="#333333",
+            hover_color="#444444",
+            corner_radius=20,
+            width=70,
+        )
+        self.select_button.pack(side="left", padx=5)
+
         # Center section - Search
         center_frame = ctk.CTkFrame(self.top_frame, fg_color="black")
         center_frame.grid(row=0, column=1)
@@ -103,158 +123,217 @@ class MyCollectionsPage(ctk.CTkFrame):
         )
         self.status_dropdown.pack(side="left", padx=5)
 
+        # Bulk actions for the selected movies, shown in selection mode
+        self.bulk_frame = ctk.CTkFrame(self.top_frame, fg_color="black")
 
-        # Container for movie posters with scrolling
-        self.movies_container_frame = ctk.CTkFrame(self, fg_color="black", border_color="black", border_width=1)
-        self.movies_container_frame.pack(fill="both", expand=True, pady=20, padx=20)
+        self.selection_label = ctk.CTkLabel(self.bulk_frame, text="0 selected", text_color="white")
+        self.selection_label.pack(side="left", padx=5)
 
-        self.canvas = ctk.CTkCanvas(self.movies_container_frame, bg="black", highlightthickness=0)
-        self.scrollbar = ctk.CTkScrollbar(self.movies_container_frame, orientation="vertical", command=self.canvas.yview)
-        self.scrollable_frame = ctk.CTkFrame(self.canvas, fg_color="black")
+        self.bulk_status_var = ctk.StringVar(value="Set status")
+        ctk.CTkOptionMenu(
+            self.bulk_frame,
+            variable=self.bulk_status_var,
+            values=["Watched", "Not Watched", "Pending"],
+            command=self.bulk_set_status,
+            corner_radius=20,
+            fg_color="#FFD700",
+            button_color="#FFBF00",
+            text_color="black"
+        ).pack(side="left", padx=5)
+
+        self.bulk_rating_var = ctk.StringVar(value="Set rating")
+        ctk.CTkOptionMenu(
+            self.bulk_frame,
+            variable=self.bulk_rating_var,
+            values=["1", "2", "3", "4", "5"],
+            command=lambda value: self.bulk_set_rating(int(value)),
+            corner_radius=20,
+            fg_color="#FFD700",
+            button_color="#FFBF00",
+            text_color="black"
+        ).pack(side="left", padx=5)
+
+        ctk.CTkButton(
+            self.bulk_frame,
+            text="Select All",
+            command=self.select_all,
+            fg_color="#333333",
+            hover_color="#444444",
+            corner_radius=20,
+            width=90,
+        ).pack(side="left", padx=5)
+
+        ctk.CTkButton(
+            self.bulk_frame,
+            text="Delete",
+            command=self.bulk_delete,
+            fg_color="#FF6347",
+            hover_color="#FF4500",
+            corner_radius=20,
+            width=70,
+        ).pack(side="left", padx=5)
 
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        )
 
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        # Virtualized grid of recycled movie cards, resizing only re-grids the existing ones
+        self.movie_grid = VirtualGrid(
+            self,
+            create_card=self.create_card,
+            bind_card=self.bind_card,
+            empty_text="No movies in collection.",
+        )
+        self.movie_grid.pack(fill="both", expand=True, pady=20, padx=20)
 
-        self.canvas.pack(side="left", fill="both", expand=True)
-        self.scrollbar.pack(side="right", fill="y")
+        # One refresh per batch of saved edits, delivered on the Tk thread
+        collection_writer.add_listener(lambda changes: UIDispatcher.post(self.on_collection_changed, changes))
 
-        # Bind resize event
-        self.bind("<Configure>", self.on_resize)
-        
         # Load initial movies
         self.load_saved_movies()
 
-    def calculate_widgets_per_row(self):
-        window_width = self.winfo_width()
-        return max(1, window_width // 200)
-
-    def display_movies(self, movies):
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
+    def display_movies(self, movies, keep_scroll=False):
+        # Only the visible cards exist, each one resolves its TMDB details when bound
+        self.displayed_version = collection_model.version
+        movies = [movie for movie in movies if movie.get("movie_id") is not None]
+        if keep_scroll:
+            # Same view after an edit, only the cards of changed movies are rebound
+            self.movie_grid.update_items(movies)
+        else:
+            self.movie_grid.set_items(movies)
+
+    def current_movies(self):
+        """The collection as the search field and status filter currently select it."""
+        status = None if self.status_var.get() == "All" else self.status_var.get()
+        return collection_model.search(self.search_entry.get(), status)
+
+    def create_card(self, parent):
+        return MovieContainer(parent, show_buttons=["delete", "update"], controller=self.controller)
+
+    def bind_card(self, card, movie):
+        # Handle custom movies and TMDB movies
+        movie_id = movie.get("movie_id", "Unknown ID")
+        custom_data = movie if movie_id == -1 else None
+
+        card.bind_movie(
+            movie_id,
+            username=self.controller.current_user,
+            initial_status=movie.get("status", "To Watch"),
+            initial_rating=movie.get("rating", 0),
+            initial_notes=movie.get("notes", ""),
+            custom_data=custom_data,  # Pass custom data for custom movies
+        )
+        self.bind_selection(card, movie)
+
+    def bind_selection(self, card, movie):
+        key = collection_model.key(movie)
+        card.set_selectable(
+            self.selection_mode,
+            key in self.selected,
+            lambda selected: self.on_card_selected(key, selected),
+        )
 
-        if not movies:
-            no_results_label = ctk.CTkLabel(self.scrollable_frame, text="No movies in collection.", text_color="white")
-            no_results_label.pack(pady=20)
-            return
+    def toggle_selection_mode(self):
+        self.selection_mode = not self.selection_mode
+        self.selected.clear()
+        self.update_selection_label()
+        self.select_button.configure(text="Done" if self.selection_mode else "Select")
+        if self.selection_mode:
+            self.bulk_frame.grid(row=1, column=0, columnspan=3, pady=(10, 0))
+        else:
+            self.bulk_frame.grid_forget()
 
-        row, col = 0, 0
-        widgets_per_row = self.calculate_widgets_per_row()
+        for index, card in self.movie_grid.bound.items():
+            self.bind_selection(card, self.movie_grid.items[index])
 
-        for movie in movies:
-            if col == widgets_per_row:
-                col = 0
-                row += 1
+    def on_card_selected(self, key, selected):
+        if selected:
+            self.selected.add(key)
+        else:
+            self.selected.discard(key)
+        self.update_selection_label()
 
-            # Handle custom movies and TMDB movies
-            movie_id = movie.get("movie_id", "Unknown ID")
-            custom_data = movie if movie_id == -1 else None
+    def select_all(self):
+        """Select every movie currently shown (after search or filter)."""
+        self.selected.update(collection_model.key(movie) for movie in self.movie_grid.items)
+        self.update_selection_label()
+        for index, card in self.movie_grid.bound.items():
+            self.bind_selection(card, self.movie_grid.items[index])
 
+    def update_selection_label(self):
+        self.selection_label.configure(text=f"{len(self.selected)} selected")
 
-            if movie.get("movie_id") is not None:
-                movie_container = MovieContainer(
-                    self.scrollable_frame,
-                    movie_id=movie.get("movie_id", "Unknown ID"),
-                    initial_status=movie.get("status", "To Watch"),
-                    initial_rating=movie.get("rating", 0),
-                    initial_notes=movie.get("notes", ""),
-                    username=self.controller.current_user,
-                    show_buttons=["delete", "update"],
-                    controller=self.controller,
-                    custom_data=custom_data,  # Pass custom data for custom movies
-                )
-                movie_container.grid(row=row, column=col, padx=18, pady=20)
+    def bulk_set_status(self, status):
+        self.bulk_status_var.set("Set status")
+        self.apply_bulk_update({"status": status})
 
-            col += 1
+    def bulk_set_rating(self, rating):
+        self.bulk_rating_var.set("Set rating")
+        self.apply_bulk_update({"rating": rating})
 
-    def on_resize(self, event=None):
-        if self.resize_timer:
-            self.after_cancel(self.resize_timer)
-        self.resize_timer = self.after(300, self.update_layout)
+    def apply_bulk_update(self, changes):
+        if not self.selected:
+            return
+        collection_model.bulk_update(self.controller.current_user, list(self.selected), changes)
+        self.after_bulk_change()
 
-    def update_layout(self):
-        if self.movie_data:
-            self.display_movies(self.movie_data)
+    def bulk_delete(self):
+        if not self.selected:
+            return
+        msg = CTkMessagebox(
+            title="Delete Movies",
+            message=f"Are you sure you want to delete {len(self.selected)} movies?",
+            icon="warning",
+            option_1="Delete",
+            option_2="Cancel"
+        )
+        if msg.get() != "Delete":
+            return
+        collection_model.bulk_delete(self.controller.current_user, list(self.selected))
+        self.after_bulk_change()
+
+    def after_bulk_change(self):
+        # The model already holds the result, show it once without waiting for the write.
+        # The current filter and search stay applied and the scroll position is kept
+        self.selected.clear()
+        self.update_selection_label()
+        self.refresh_movies()
+        # Cards that weren't rebound still show their old checkbox state
+        for index, card in self.movie_grid.bound.items():
+            self.bind_selection(card, self.movie_grid.items[index])
 
     def load_saved_movies(self):
         current_user = self.controller.current_user
         if not current_user:
             return
 
-        user_file = os.path.join(USER_DATA_FOLDER, f"{current_user}.json")
-        if not os.path.exists(user_file):
-            return
-
-        try:
-            with open(user_file, "r") as file:
-                self.movie_data = json.loads(file.read())
-                self.display_movies(self.movie_data)
-        except json.JSONDecodeError as e:
-            print(f"Error decoding JSON: {e}")
+        # Read the store once per login, afterwards the model is kept up to date in memory
+        collection_model.load(current_user)
+        self.selected.clear()
+        self.update_selection_label()
+        self.movie_data = self.current_movies()
+        self.display_movies(self.movie_data)
 
 
     def search_movies(self):
-        """Search movies based on title or notes."""
-        search_term = self.search_entry.get().lower()  # Get the text input from the search field
-        current_user = self.controller.current_user
-        user_file = os.path.join(USER_DATA_FOLDER, f"{current_user}.json")
-
-        if not os.path.exists(user_file):
-            print(f"File not found: {user_file}")
-            return
-
-        try:
-            with open(user_file, "r") as file:
-                raw_data = file.read()
-                user_data = json.loads(raw_data)
-        except json.JSONDecodeError as e:
-            print(f"Error decoding JSON: {e}")
-            return
-
-        # filtered_movies = [movie for movie in user_data if search_term in movie.get("title", "").lower() or search_term in movie.get("notes", "").lower()]
-        filtered_movies = [movie for movie in user_data if 
-            search_term in movie.get("title", "").lower() or
-            search_term in movie.get("notes", "").lower() or
-            search_term in movie.get("status", "").lower() or
-            search_term in str(movie.get("rating", "")).lower() or
-            search_term in movie.get("type", "").lower() or
-            any(search_term in genre.get("name", "").lower() for genre in movie.get("genres", []))
-        ]
-        
-        self.display_movies(filtered_movies)
+        """Search movies by title, notes, status, rating, type or genre, within the status filter."""
+        self.display_movies(self.current_movies())
 
     def filter_movies(self, selected_status):
-        """Filter movies based on selected status."""
-        filter_criteria = selected_status  # The selected status from the dropdown
-        current_user = self.controller.current_user
-        user_file = os.path.join(USER_DATA_FOLDER, f"{current_user}.json")
-
-        if not os.path.exists(user_file):
-            print(f"File not found: {user_file}")
-            return
+        """Filter movies based on selected status ("All" doesn't filter), keeping the search."""
+        self.display_movies(self.current_movies())
 
-        try:
-            with open(user_file, "r") as file:
-                raw_data = file.read()
-                user_data = json.loads(raw_data)
-        except json.JSONDecodeError as e:
-            print(f"Error decoding JSON: {e}")
+    def on_collection_changed(self, changes):
+        # Edits already on screen (bulk changes) need nothing
+        if collection_model.version == self.displayed_version:
             return
-
-        # If "All" is selected, don't filter
-        if filter_criteria == "All":
-            self.display_movies(user_data)
-        else:
-            filtered_movies = [movie for movie in user_data if movie.get("status") == filter_criteria]
-            self.display_movies(filtered_movies)
+        if any(change[0] == self.controller.current_user for change in changes):
+            self.refresh_movies()
 
     def refresh_movies(self):
-        print("Refreshing movies...")
-        self.load_saved_movies()
+        """Re-run the current search and filter on the model, keeping the scroll position."""
+        if collection_model.username != self.controller.current_user:
+            self.load_saved_movies()
+            return
+        self.movie_data = self.current_movies()
+        self.display_movies(self.movie_data, keep_scroll=True)
 
 
     def show_add_movie_form(self):
@@ -378,6 +457,9 @@ class MyCollectionsPage(ctk.CTkFrame):
         if not self.title_entry.get():
             CTkMessagebox(title="Error", message="Title is required!", icon="warning")
             return
+        if collection_model.custom_title_taken(self.title_entry.get()):
+            CTkMessagebox(title="Error", message="A custom movie with this title already exists!", icon="warning")
+            return
 
         # Save image if selected
         image_path = None
@@ -399,23 +481,11 @@ class MyCollectionsPage(ctk.CTkFrame):
             "poster_path": image_path,
         }
 
-        # Save to user's JSON file
-        user_file = os.path.join(USER_DATA_FOLDER, f"{self.controller.current_user}.json")
         try:
-            if os.path.exists(user_file):
-                with open(user_file, "r") as f:
-                    movies = json.load(f)
-            else:
-                movies = []
-            
-            movies.append(custom_movie)
-            
-            with open(user_file, "w") as f:
-                json.dump(movies, f, indent=4)
+            collection_model.upsert(self.controller.current_user, custom_movie)
 
             CTkMessagebox(title="Success", message="Movie added successfully!", icon="check")
             self.form_window.destroy()
-            self.refresh_movies()
 
         except Exception as e:
             CTkMessagebox(title="Error", message=f"Failed to save movie: {str(e)}", icon="error")
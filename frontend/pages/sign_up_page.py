@@ -2,10 +2,8 @@ import tkinter as tk
 import customtkinter as ctk
 from CTkMessagebox import CTkMessagebox
 from PIL import Image, ImageTk
-import os
-import json
 from pytablericons import TablerIcons, OutlineIcon
-from backend.config import USERS_FILE, USER_DATA_FOLDER
+from backend.user_store import user_store
 
 
 
@@ -113,28 +111,6 @@ class SignUpPage(ctk.CTkFrame):
         self.confirm_password_entry.delete(0, 'end')
         self.email_entry.delete(0, 'end')
 
-    def load_users(self):
-        if not os.path.exists(USERS_FILE):
-            with open(USERS_FILE, "w") as f:
-                json.dump({}, f)
-
-        try:
-            with open(USERS_FILE, "r") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            return {}
-
-    def save_users(self, users):
-        with open(USERS_FILE, "w") as f:
-            json.dump(users, f, indent=4)
-
-    def create_user_file(self, username):
-        os.makedirs(USER_DATA_FOLDER, exist_ok=True)
-        user_file = os.path.join(USER_DATA_FOLDER, f"{username}.json")
-        if not os.path.exists(user_file):
-            with open(user_file, "w") as f:
-                json.dump({}, f)
-
     def register_user(self):
         username = self.username_entry.get()
         password = self.password_entry.get()
@@ -149,17 +125,11 @@ class SignUpPage(ctk.CTkFrame):
             CTkMessagebox(title="Sign Up Error", message="Passwords do not match", icon="cancel")
             return
 
-        users = self.load_users()
-
-        if username in users:
+        # Single atomic insert, fails if the name is taken (also by another instance)
+        if not user_store.add(username, password, email):
             CTkMessagebox(title="Sign Up Error", message="User already exists", icon="cancel")
         else:
-            users[username] = {
-                "password": password,
-                "email": email
-            }
-            self.save_users(users)
-            self.create_user_file(username)
+            # The collection starts empty in the collection store, no per-user file needed
 
             CTkMessagebox(title="Sign Up Success", message=f"User {username} registered successfully", icon="check")
             self.controller.show_frame("LoginPage")
@@ -5,6 +5,11 @@ from frontend.pages.cine_guru_page import CineGuruPage
 from frontend.pages.login_page import LoginPage
 from frontend.pages.sign_up_page import SignUpPage
 from frontend.components.side_bar import Sidebar
+from frontend.components.ui_dispatcher import UIDispatcher
+from backend.collection_store import collection_store
+from backend.collection_writer import collection_writer
+from backend.user_store import user_store
+from backend.async_client import async_client
 
 class MovieApp(ctk.CTk):
     def __init__(self):
@@ -20,7 +25,13 @@ class MovieApp(ctk.CTk):
 
         self.frames = {}
 
-       
+        # Lets background workers hand results back to the Tk thread
+        UIDispatcher.attach(self)
+
+        # Import the old JSON account and collection files once, then keep the write-ahead log folded
+        user_store.migrate_json_file()
+        collection_store.migrate_json_files()
+        collection_store.start_compactor()
 
         self.attributes('-alpha', 0.90)
         self.create_container()
@@ -41,6 +52,8 @@ class MovieApp(ctk.CTk):
         # Start with LoginPage
         self.show_frame("LoginPage")
 
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
     def create_container(self):
         self.container = ctk.CTkFrame(self, fg_color="black")
         self.container.pack(side="right", fill="both", expand=True)
@@ -63,6 +76,15 @@ class MovieApp(ctk.CTk):
         self.current_user = username
         print(f"Logged in as: {self.current_user}")
 
+    def on_close(self):
+        # Write queued collection edits, then leave the database checkpointed
+        collection_writer.flush()
+        collection_store.close()
+        # Stop background TMDB traffic before its session goes away
+        self.frames["CineGuruPage"].backend.close()
+        async_client.close()
+        self.destroy()
+
 
 if __name__ == "__main__":
     # Run the MovieApp